@@ -1,128 +1,233 @@
 from models import db, PersonalizedAdvice, Transaction, UserXP, FinancialGoal, Member
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
 import random
-from sqlalchemy import func
+import time
+from operator import attrgetter
+from dataclasses import dataclass
+from sqlalchemy import func, case, and_, select, update
+
+RECENT_WINDOW = timedelta(days=30)
+
+# Coalesces repeated dashboard refreshes: user_id -> (expires_at, advice_text)
+ADVICE_CACHE_TTL = 60
+ADVICE_CACHE_MAX_USERS = 10000
+advice_cache = {}
+
+# A single worker keeps advice inserts ordered without blocking the response
+advice_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='advice-writer')
+
+@dataclass(slots=True, frozen=True)
+class Advice:
+    """A candidate piece of advice; the highest priority one is shown"""
+    text: str
+    type: str
+    priority: int
+
+FIRST_STEP_ADVICE = Advice(
+    text="🌟 Start your savings journey today! Making your first contribution is the hardest step, but also the most rewarding.",
+    type='motivation',
+    priority=10
+)
+
+MILESTONE_ADVICE = Advice(
+    text="💰 You've saved over $1,000! Consider diversifying into an emergency fund or investment account.",
+    type='strategic',
+    priority=6
+)
+
+ADVICE_TEMPLATES = {
+    'engagement': "💪 You've saved ${total_saved:.2f} so far - great work! But we haven't seen you contribute in 30 days. Get back on track today!",
+    'celebration': "🔥 You're on fire! {recent_count} contributions this month. Keep this momentum going!",
+    'streak_celebration': "⚡ Amazing {streak}-day streak! You're building incredible financial discipline.",
+    'streak_motivation': "📈 {streak}-day streak! Keep going to unlock bonus XP at day 7.",
+    'goal_close': "🎯 You're {progress_pct:.0f}% toward your '{goal_name}' goal! Just ${remaining:.2f} to go!",
+    'goal_halfway': "👍 Halfway there on '{goal_name}'! You've got this!",
+    'insights': "📊 At your current pace (${avg_contribution:.2f}/contribution), you'll save ~${monthly_projection:.2f} per month!",
+}
+
+GENERAL_TIPS = (
+    Advice("💡 The 50/30/20 rule: 50% needs, 30% wants, 20% savings. Are you on track?", "education", 4),
+    Advice("🏦 Build an emergency fund covering 3-6 months of expenses for financial security.", "education", 4),
+    Advice("📱 Automate your savings! Set up recurring contributions to make saving effortless.", "strategy", 4),
+    Advice("🎯 Set specific, measurable financial goals. Vague goals rarely get achieved!", "strategy", 4),
+)
 
 def generate_personalized_advice(user_id):
     """Generate context-aware financial advice based on user behavior"""
     
-    contributions = Transaction.query.join(Transaction.member).filter(
-        Transaction.member.has(user_id=user_id),
+    cached = advice_cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    advice_text = build_personalized_advice(user_id)
+    
+    if len(advice_cache) >= ADVICE_CACHE_MAX_USERS:
+        advice_cache.clear()
+    advice_cache[user_id] = (time.monotonic() + ADVICE_CACHE_TTL, advice_text)
+    
+    return advice_text
+
+def build_personalized_advice(user_id):
+    """Score advice candidates for the user and queue the winner for storage"""
+    
+    cutoff = datetime.utcnow() - RECENT_WINDOW
+    is_recent = Transaction.transaction_date > cutoff
+    
+    contribution_stats = db.session.query(
+        func.count(Transaction.id).label('total_count'),
+        func.coalesce(func.sum(Transaction.amount), 0).label('total_saved'),
+        func.count(case((is_recent, 1))).label('recent_count'),
+        func.coalesce(func.sum(case((is_recent, Transaction.amount))), 0).label('recent_sum')
+    ).join(Member).filter(
+        Member.user_id == user_id,
         Transaction.transaction_type == 'contribution'
+    ).subquery()
+    
+    current_streak = db.session.query(UserXP.current_streak).filter(
+        UserXP.user_id == user_id
+    ).limit(1).scalar_subquery()
+    
+    # One round-trip: the single stats row, the streak as a scalar subquery,
+    # and one row per advice-worthy goal (or a single row of NULLs when there are none).
+    rows = db.session.query(
+        contribution_stats,
+        current_streak.label('current_streak'),
+        FinancialGoal.goal_name,
+        FinancialGoal.target_amount,
+        FinancialGoal.current_amount,
+        (FinancialGoal.current_amount * 100 / FinancialGoal.target_amount).label('progress_pct')
+    ).select_from(contribution_stats).outerjoin(
+        FinancialGoal,
+        and_(
+            FinancialGoal.user_id == user_id,
+            FinancialGoal.achieved == False,
+            FinancialGoal.target_amount > 0,
+            # Only goals at least halfway done produce advice
+            FinancialGoal.current_amount * 2 >= FinancialGoal.target_amount
+        )
     ).all()
     
-    total_saved = sum(t.amount for t in contributions)
-    recent_contributions = [t for t in contributions if t.transaction_date > datetime.utcnow() - timedelta(days=30)]
+    stats = rows[0]
+    total_count, total_saved = stats.total_count, stats.total_saved
+    recent_count, recent_sum = stats.recent_count, stats.recent_sum
+    active_goals = [row for row in rows if row.goal_name is not None]
     
-    advice_list = []
+    # Brand-new users can only ever get the onboarding nudge; skip scoring and the write
+    if total_count == 0 and stats.current_streak is None and not active_goals:
+        return FIRST_STEP_ADVICE.text
     
-    if len(contributions) == 0:
-        advice_list.append({
-            'text': "🌟 Start your savings journey today! Making your first contribution is the hardest step, but also the most rewarding.",
-            'type': 'motivation',
-            'priority': 10
-        })
-    
-    elif len(recent_contributions) == 0:
-        advice_list.append({
-            'text': f"💪 You've saved ${total_saved:.2f} so far - great work! But we haven't seen you contribute in 30 days. Get back on track today!",
-            'type': 'engagement',
-            'priority': 9
-        })
+    advice_list = []
     
-    elif len(recent_contributions) >= 4:
-        advice_list.append({
-            'text': f"🔥 You're on fire! {len(recent_contributions)} contributions this month. Keep this momentum going!",
-            'type': 'celebration',
-            'priority': 8
-        })
+    if total_count == 0:
+        advice_list.append(FIRST_STEP_ADVICE)
+    
+    elif recent_count == 0:
+        advice_list.append(Advice(
+            text=ADVICE_TEMPLATES['engagement'].format(total_saved=total_saved),
+            type='engagement',
+            priority=9
+        ))
+    
+    elif recent_count >= 4:
+        advice_list.append(Advice(
+            text=ADVICE_TEMPLATES['celebration'].format(recent_count=recent_count),
+            type='celebration',
+            priority=8
+        ))
+    
+    if stats.current_streak is not None:
+        if stats.current_streak >= 7:
+            advice_list.append(Advice(
+                text=ADVICE_TEMPLATES['streak_celebration'].format(streak=stats.current_streak),
+                type='streak_celebration',
+                priority=9
+            ))
+        elif stats.current_streak >= 3:
+            advice_list.append(Advice(
+                text=ADVICE_TEMPLATES['streak_motivation'].format(streak=stats.current_streak),
+                type='streak_motivation',
+                priority=7
+            ))
     
-    user_xp = UserXP.query.filter_by(user_id=user_id).first()
-    if user_xp:
-        if user_xp.current_streak >= 7:
-            advice_list.append({
-                'text': f"⚡ Amazing {user_xp.current_streak}-day streak! You're building incredible financial discipline.",
-                'type': 'streak_celebration',
-                'priority': 9
-            })
-        elif user_xp.current_streak >= 3:
-            advice_list.append({
-                'text': f"📈 {user_xp.current_streak}-day streak! Keep going to unlock bonus XP at day 7.",
-                'type': 'streak_motivation',
-                'priority': 7
-            })
-    
-    active_goals = FinancialGoal.query.filter_by(user_id=user_id, achieved=False).all()
     for goal in active_goals:
-        progress_pct = (goal.current_amount / goal.target_amount) * 100 if goal.target_amount > 0 else 0
-        
-        if progress_pct >= 75:
-            advice_list.append({
-                'text': f"🎯 You're {progress_pct:.0f}% toward your '{goal.goal_name}' goal! Just ${goal.target_amount - goal.current_amount:.2f} to go!",
-                'type': 'goal_progress',
-                'priority': 10
-            })
-        elif progress_pct >= 50:
-            advice_list.append({
-                'text': f"👍 Halfway there on '{goal.goal_name}'! You've got this!",
-                'type': 'goal_progress',
-                'priority': 7
-            })
+        if goal.progress_pct >= 75:
+            advice_list.append(Advice(
+                text=ADVICE_TEMPLATES['goal_close'].format(
+                    progress_pct=goal.progress_pct,
+                    goal_name=goal.goal_name,
+                    remaining=goal.target_amount - goal.current_amount
+                ),
+                type='goal_progress',
+                priority=10
+            ))
+        else:
+            advice_list.append(Advice(
+                text=ADVICE_TEMPLATES['goal_halfway'].format(goal_name=goal.goal_name),
+                type='goal_progress',
+                priority=7
+            ))
     
     if total_saved >= 1000:
-        advice_list.append({
-            'text': f"💰 You've saved over $1,000! Consider diversifying into an emergency fund or investment account.",
-            'type': 'strategic',
-            'priority': 6
-        })
+        advice_list.append(MILESTONE_ADVICE)
     
-    avg_contribution = sum(t.amount for t in recent_contributions) / len(recent_contributions) if recent_contributions else 0
+    avg_contribution = recent_sum / recent_count if recent_count else 0
     if avg_contribution > 0:
         weekly_projection = avg_contribution * 52 / 12
-        advice_list.append({
-            'text': f"📊 At your current pace (${avg_contribution:.2f}/contribution), you'll save ~${weekly_projection:.2f} per month!",
-            'type': 'insights',
-            'priority': 5
-        })
+        advice_list.append(Advice(
+            text=ADVICE_TEMPLATES['insights'].format(
+                avg_contribution=avg_contribution,
+                monthly_projection=weekly_projection
+            ),
+            type='insights',
+            priority=5
+        ))
     
-    general_tips = [
-        {"text": "💡 The 50/30/20 rule: 50% needs, 30% wants, 20% savings. Are you on track?", "type": "education", "priority": 4},
-        {"text": "🏦 Build an emergency fund covering 3-6 months of expenses for financial security.", "type": "education", "priority": 4},
-        {"text": "📱 Automate your savings! Set up recurring contributions to make saving effortless.", "type": "strategy", "priority": 4},
-        {"text": "🎯 Set specific, measurable financial goals. Vague goals rarely get achieved!", "type": "strategy", "priority": 4}
-    ]
-    
-    advice_list.extend(general_tips)
-    
-    advice_list.sort(key=lambda x: x['priority'], reverse=True)
+    advice_list.extend(GENERAL_TIPS)
     
     if advice_list:
-        top_advice = advice_list[0]
+        top_advice = max(advice_list, key=attrgetter('priority'))
         
-        personalized_advice = PersonalizedAdvice(
-            user_id=user_id,
-            advice_text=top_advice['text'],
-            advice_type=top_advice['type'],
-            context_data=f"total_saved: {total_saved}, recent_contributions: {len(recent_contributions)}",
-            displayed=False
-        )
-        db.session.add(personalized_advice)
-        db.session.commit()
+        advice_writer.submit(save_advice, current_app._get_current_object(), {
+            'user_id': user_id,
+            'advice_text': top_advice.text,
+            'advice_type': top_advice.type,
+            'context_data': {'total_saved': float(total_saved), 'recent_count': recent_count},
+            'displayed': False
+        })
         
-        return top_advice['text']
+        return top_advice.text
     
     return "Keep saving consistently - your future self will thank you!"
 
+def save_advice(app, advice_fields):
+    """Persist generated advice off the request thread"""
+    with app.app_context():
+        try:
+            db.session.add(PersonalizedAdvice(**advice_fields))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Saving advice failed: {e}")
+
 def get_latest_advice(user_id):
     """Get the latest undisplayed advice for user"""
-    advice = PersonalizedAdvice.query.filter_by(
-        user_id=user_id,
-        displayed=False
-    ).order_by(PersonalizedAdvice.created_at.desc()).first()
-    
-    if advice:
-        advice.displayed = True
+    newest_undisplayed = select(PersonalizedAdvice.id).where(
+        PersonalizedAdvice.user_id == user_id,
+        PersonalizedAdvice.displayed == False
+    ).order_by(PersonalizedAdvice.created_at.desc()).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+    
+    # Claim and mark the row in one atomic statement so concurrent requests never show the same advice twice
+    advice_text = db.session.execute(
+        update(PersonalizedAdvice)
+        .where(PersonalizedAdvice.id == newest_undisplayed)
+        .values(displayed=True)
+        .returning(PersonalizedAdvice.advice_text)
+    ).scalar()
+    
+    if advice_text is not None:
         db.session.commit()
-        return advice.advice_text
+        return advice_text
     
     return generate_personalized_advice(user_id)
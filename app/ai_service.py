@@ -5,10 +5,17 @@ Uses Replit AI Integrations (Gemini) - no API key required, charges billed to cr
 
 import os
 import json
+import re
 import random
+from types import MappingProxyType
 from typing import Optional
 from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from google import genai
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
@@ -29,6 +36,12 @@ if AI_INTEGRATIONS_GEMINI_API_KEY and AI_INTEGRATIONS_GEMINI_BASE_URL:
     except Exception as e:
         print(f"Note: Gemini AI client not initialized: {e}")
 
+URL_PATTERN = re.compile(r'^https?://\S+$')
+
+# Short proverb/translation prompts don't benefit from reasoning; skipping it
+# removes the thinking phase that runs before the first output token
+NO_THINKING = types.ThinkingConfig(thinking_budget=0)
+
 SUPPORTED_LANGUAGES = {
     'en': 'English',
     'ht': 'Haitian Creole',
@@ -59,6 +72,45 @@ LANGUAGE_FLAGS = {
     'de': '🇩🇪'
 }
 
+# Read-only shared entries; get_fallback_proverb hands callers a dict copy
+FALLBACK_PROVERBS = tuple(MappingProxyType(proverb) for proverb in (
+    {
+        "creole": "Ansanm nou fò, separe nou fèb",
+        "english": "Together we are strong, apart we are weak",
+        "meaning": "Unity brings strength to the community"
+    },
+    {
+        "creole": "Lajan pa fèt nan yon jou",
+        "english": "Money isn't made in a day",
+        "meaning": "Wealth building requires patience and time"
+    },
+    {
+        "creole": "Kote ki gen kè, gen chemen",
+        "english": "Where there is heart, there is a way",
+        "meaning": "Determination overcomes all obstacles"
+    },
+    {
+        "creole": "Pitit piti, kay monte",
+        "english": "Little by little, the house gets built",
+        "meaning": "Small consistent efforts lead to great achievements"
+    },
+    {
+        "creole": "Men anpil, chay pa lou",
+        "english": "Many hands make the load lighter",
+        "meaning": "Working together makes difficult tasks easier"
+    }
+))
+
+def load_json(text: str):
+    """Parse JSON with orjson when it is installed."""
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def dump_json(value) -> str:
+    """Serialize JSON (non-ASCII kept as-is) with orjson when it is installed."""
+    return orjson.dumps(value).decode() if orjson else json.dumps(value, ensure_ascii=False)
+
+
 def is_rate_limit_error(exception: BaseException) -> bool:
     """Check if the exception is a rate limit or quota violation error."""
     error_msg = str(exception)
@@ -99,11 +151,12 @@ Return ONLY valid JSON in this exact format (no other text):
             model="gemini-2.5-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
-                response_mime_type="application/json"
+                response_mime_type="application/json",
+                thinking_config=NO_THINKING
             )
         )
         
-        result = json.loads(response.text or "{}")
+        result = load_json(response.text or "{}")
         
         if 'creole' in result and 'english' in result:
             return {
@@ -119,34 +172,7 @@ Return ONLY valid JSON in this exact format (no other text):
 
 def get_fallback_proverb() -> dict:
     """Return a fallback proverb if AI generation fails."""
-    fallback_proverbs = [
-        {
-            "creole": "Ansanm nou fò, separe nou fèb",
-            "english": "Together we are strong, apart we are weak",
-            "meaning": "Unity brings strength to the community"
-        },
-        {
-            "creole": "Lajan pa fèt nan yon jou",
-            "english": "Money isn't made in a day",
-            "meaning": "Wealth building requires patience and time"
-        },
-        {
-            "creole": "Kote ki gen kè, gen chemen",
-            "english": "Where there is heart, there is a way",
-            "meaning": "Determination overcomes all obstacles"
-        },
-        {
-            "creole": "Pitit piti, kay monte",
-            "english": "Little by little, the house gets built",
-            "meaning": "Small consistent efforts lead to great achievements"
-        },
-        {
-            "creole": "Men anpil, chay pa lou",
-            "english": "Many hands make the load lighter",
-            "meaning": "Working together makes difficult tasks easier"
-        }
-    ]
-    return random.choice(fallback_proverbs)
+    return dict(random.choice(FALLBACK_PROVERBS))
 
 
 def translate_text(text: str, target_language: str) -> str:
@@ -154,37 +180,78 @@ def translate_text(text: str, target_language: str) -> str:
     Translate text to the target language with cultural accuracy.
     Uses AI for nuanced, contextual translations.
     """
-    if target_language not in SUPPORTED_LANGUAGES:
+    if not is_translatable(text):
         return text
     
+    return translate_texts([text], target_language)[0]
+
+
+def is_translatable(text: str) -> bool:
+    """Blank strings, bare numbers and URLs read the same in every language."""
+    stripped = text.strip() if text else ''
+    return bool(stripped) and not stripped.isdigit() and not URL_PATTERN.match(stripped)
+
+
+def translate_texts(texts: list, target_language: str) -> list:
+    """
+    Translate several strings with a single AI request.
+    Returns the originals unchanged if translation is unavailable or fails.
+    """
+    if target_language not in SUPPORTED_LANGUAGES:
+        return list(texts)
+    
     if target_language == 'en':
-        return text
+        return list(texts)
     
     if not client:
-        return text
+        return list(texts)
     
+    pending = tuple(dict.fromkeys(text for text in texts if is_translatable(text)))
+    if not pending:
+        return list(texts)
+    
+    try:
+        translated = dict(zip(pending, fetch_translations(pending, target_language)))
+    except Exception as e:
+        print(f"Translation failed: {e}")
+        return list(texts)
+    
+    return [translated.get(text, text) for text in texts]
+
+
+@lru_cache(maxsize=4096)
+def fetch_translations(texts: tuple, target_language: str) -> tuple:
+    """
+    Request a batch translation from Gemini, memoized per (texts, language).
+    Errors propagate so a failed call is never cached.
+    """
     language_name = SUPPORTED_LANGUAGES[target_language]
     
-    prompt = f"""Translate the following text to {language_name}. 
+    prompt = f"""Translate each string in the following JSON array to {language_name}. 
 This is for a community savings application called TiKòb. 
-Ensure the translation is:
+Ensure each translation is:
 - Culturally appropriate and natural-sounding
 - Accurate in meaning (not a literal word-for-word translation)
 - Uses common, accessible vocabulary
 
-Text to translate: "{text}"
+Strings to translate: {dump_json(list(texts))}
 
-Return ONLY the translated text, nothing else."""
+Return ONLY a JSON array of the translated strings, in the same order and of the same length."""
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
+    response = client.models.generate_content(
+        model="gemini-2.5-flash",
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            thinking_config=NO_THINKING
         )
-        return response.text.strip().strip('"') if response.text else text
-    except Exception as e:
-        print(f"Translation failed: {e}")
-        return text
+    )
+    
+    translated = load_json(response.text or "[]")
+    if not isinstance(translated, list) or len(translated) != len(texts):
+        raise ValueError(f"Expected {len(texts)} translations, got {translated!r}")
+    
+    return tuple(str(item).strip() for item in translated)
 
 
 UI_TRANSLATIONS = {
@@ -587,25 +654,30 @@ UI_TRANSLATIONS = {
 }
 
 
+# Each language layered over English so missing keys fall back without a second lookup
+MERGED_UI_TRANSLATIONS = {
+    language: {**UI_TRANSLATIONS['en'], **texts}
+    for language, texts in UI_TRANSLATIONS.items()
+}
+
+
+@lru_cache(maxsize=512)
 def get_ui_text(key: str, language: str = 'en') -> str:
     """Get UI text in the specified language."""
-    if language not in UI_TRANSLATIONS:
-        language = 'en'
-    
-    translations = UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['en'])
-    return translations.get(key, UI_TRANSLATIONS['en'].get(key, key))
+    return MERGED_UI_TRANSLATIONS.get(language, MERGED_UI_TRANSLATIONS['en']).get(key, key)
 
 
 def get_all_ui_texts(language: str = 'en') -> dict:
     """Get all UI translations for a language."""
-    if language not in UI_TRANSLATIONS:
-        language = 'en'
-    return UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['en'])
+    return MERGED_UI_TRANSLATIONS.get(language, MERGED_UI_TRANSLATIONS['en'])
+
+
+LANGUAGE_OPTIONS = [
+    {'code': code, 'name': name, 'flag': LANGUAGE_FLAGS.get(code, '🌐')}
+    for code, name in SUPPORTED_LANGUAGES.items()
+]
 
 
 def get_language_options() -> list:
-    """Get list of available languages with flags."""
-    return [
-        {'code': code, 'name': name, 'flag': LANGUAGE_FLAGS.get(code, '🌐')}
-        for code, name in SUPPORTED_LANGUAGES.items()
-    ]
+    """Get list of available languages with flags (shared; do not mutate)."""
+    return LANGUAGE_OPTIONS
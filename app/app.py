@@ -1,25 +1,37 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, Response, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, send_from_directory, Response, jsonify, g, stream_with_context, abort
 from flask_wtf.csrf import CSRFProtect
+from jinja2 import FileSystemBytecodeCache
 from flask_migrate import Migrate
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 from flask_socketio import SocketIO, emit, join_room, leave_room
-from models import db, User, Group, Member, Transaction, Badge, UserBadge, GroupMessage, MessageReaction, TellerAccount
+from models import db, User, Group, Member, Transaction, Badge, UserBadge, GroupMessage, MessageReaction, TellerAccount, PlaidAccount, PersonalTransaction, GROUP_TOTAL_COLUMNS, adjust_group_column
 from werkzeug.utils import secure_filename
-from utils import convert_currency, get_random_quote, check_and_award_badges, generate_group_report_csv, get_financial_advice, seed_initial_data, cleanup_old_receipts
-from notifications import send_contribution_notification, send_approval_notification, send_badge_notification, send_payout_notification
+from werkzeug.security import safe_join
+from utils import convert_currency, get_random_quote, check_and_award_badges, get_all_badges, iter_group_report_csv, get_financial_advice, seed_initial_data, cleanup_old_receipts
+from notifications import send_approval_notification, notify_badges_earned, notify_group_transaction
 from xp_service import award_xp, update_streak, get_user_rank, check_challenge_progress
 from advice_service import get_latest_advice
 from currency_service import fetch_exchange_rates, convert_amount, get_user_currency, format_currency
 from haitian_culture import get_random_proverb, get_financial_wisdom, get_community_phrase
 from avatar_helper import get_user_initials, get_avatar_color
+from traditions_data import get_all_traditions, get_tradition_theme_colors
 from ledger_service import LedgerService, ReconciliationService, TaxReportService, LedgerError
 from ai_service import generate_haitian_proverb, get_language_options, get_all_ui_texts, UI_TRANSLATIONS, SUPPORTED_LANGUAGES
-from decimal import Decimal
+from sqlalchemy import event, and_, or_, func, case, select, bindparam
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, aliased, joinedload, selectinload
+from decimal import Decimal, InvalidOperation
 import os
+import base64
+import hashlib
+import mimetypes
+import sqlite3
 import secrets
-from datetime import datetime, date
+from functools import lru_cache
+from datetime import datetime, date, timedelta
 from collections import defaultdict
 import time
 
@@ -29,6 +41,15 @@ MAX_LOGIN_ATTEMPTS = 5
 
 UPLOAD_FOLDER = 'app/uploads/receipts'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
+ALLOWED_SUFFIXES = tuple(f'.{extension}' for extension in ALLOWED_EXTENSIONS)
+RECEIPT_HASH_CHUNK_SIZE = 64 * 1024
+GROUP_CODE_BYTES = 4
+GROUP_CODE_ATTEMPTS = 5
+LEDGER_PAGE_SIZE = 50
+MAX_BATCH_TRANSACTIONS = 500
+CENTS = Decimal('0.01')
+# Largest amount a Numeric(12, 2) column holds
+MAX_TRANSACTION_AMOUNT = Decimal('9999999999.99')
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SESSION_SECRET', 'dev-secret-key-change-in-production')
@@ -38,21 +59,68 @@ if database_url and database_url.startswith('postgres://'):
     database_url = database_url.replace('postgres://', 'postgresql://', 1)
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url or 'sqlite:///tikob.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if database_url:
+    # Keep warm connections for the threaded workers and drop ones the server closed
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': 10, 'max_overflow': 10, 'pool_pre_ping': True}
+else:
+    # Wait on a locked SQLite file instead of failing immediately under concurrent writers
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30}}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Share compiled templates across gunicorn workers and restarts; defaults to a per-user temp dir
+jinja_cache_dir = os.environ.get('JINJA_CACHE_DIR')
+if jinja_cache_dir:
+    os.makedirs(jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024
+# Internal nginx location aliased to UPLOAD_FOLDER; when set, receipts are sent by nginx via X-Accel-Redirect
+app.config['RECEIPTS_ACCEL_PREFIX'] = os.environ.get('RECEIPTS_ACCEL_PREFIX')
+# Behind Apache with mod_xsendfile, let the server send files that send_file/send_from_directory return
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+# Turn accidental lazy loads in list views into errors; enabled in tests and CI
+app.config['RAISE_ON_LAZY_LOAD'] = os.environ.get('RAISE_ON_LAZY_LOAD') == '1'
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Keep sessions in Redis when one is configured, so the cookie only carries a session id;
+# needs the `redis` extra (flask-session and redis)
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    import redis
+    from flask_session import Session
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(redis_url)
+    # Sign the session id and keep browser-session cookies, as the signed cookie session did
+    app.config['SESSION_USE_SIGNER'] = True
+    app.config['SESSION_PERMANENT'] = False
+    app.config['SESSION_KEY_PREFIX'] = 'tikob:session:'
+    Session(app)
+
 csrf = CSRFProtect(app)
 migrate = Migrate(app, db)
 db.init_app(app)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so dashboard reads don't block on contribution writes"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.execute('PRAGMA cache_size=-65536')
+    cursor.close()
+
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+# Only the auth routes carry limits; a global default added counter bookkeeping to every request.
+# Point RATELIMIT_STORAGE_URL at Redis so all workers share one set of counters.
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
-    default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://"
+    storage_uri=os.environ.get('RATELIMIT_STORAGE_URL', 'memory://'),
+    strategy='moving-window'
 )
 
 if os.environ.get('FLASK_ENV') == 'production':
@@ -67,7 +135,8 @@ def set_security_headers(response):
     response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
     return response
 
-with app.app_context():
+def init_database():
+    """Create tables and seed badges and traditions; run once per deploy, not in every worker"""
     db.create_all()
     seed_initial_data()
     from traditions_data import seed_traditions
@@ -76,16 +145,58 @@ with app.app_context():
     except Exception as e:
         print(f"Note: Traditions already seeded or error: {e}")
 
+@app.cli.command('seed')
+def seed_command():
+    """Create tables and seed reference data (flask --app app seed)"""
+    init_database()
+
+def current_user():
+    """The signed-in user, fetched at most once per request and only when asked for"""
+    if 'user' not in g:
+        user_id = session.get('user_id')
+        g.user = db.session.get(User, user_id) if user_id else None
+    return g.user
+
+def eager_load(*options):
+    """Loader options for list views, plus raiseload('*') when RAISE_ON_LAZY_LOAD is on"""
+    if app.config['RAISE_ON_LAZY_LOAD']:
+        return (*options, raiseload('*'))
+    return options
+
+def generate_group_code():
+    """Random 8-character uppercase hex code; b16encode emits uppercase directly"""
+    return base64.b16encode(secrets.token_bytes(GROUP_CODE_BYTES)).decode('ascii')
+
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
+def save_receipt(file):
+    """Store an upload under the SHA-256 of its contents; identical receipts share one file"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.stream.read(RECEIPT_HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    
+    receipt_filename = f"{digest.hexdigest()}.{file.filename.rsplit('.', 1)[1].lower()}"
+    path = os.path.join(app.config['UPLOAD_FOLDER'], receipt_filename)
+    if not os.path.exists(path):
+        file.stream.seek(0)
+        file.save(path)
+    return receipt_filename
+
+def login_redirect():
+    """Send the request to the login page, dropping a session whose user no longer exists"""
+    session.pop('user_id', None)
+    session.pop('username', None)
+    flash('Please log in to access this page.', 'warning')
+    return redirect(url_for('login'))
 
 def login_required(f):
     from functools import wraps
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        # Only the session id is checked; views that need the User row call current_user()
         if 'user_id' not in session:
-            flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
+            return login_redirect()
         return f(*args, **kwargs)
     return decorated_function
 
@@ -107,12 +218,15 @@ def signup():
         email = request.form.get('email')
         password = request.form.get('password')
         
-        if User.query.filter_by(username=username).first():
-            flash('Username already exists.', 'danger')
-            return redirect(url_for('signup'))
+        existing = db.session.query(User.username, User.email).filter(
+            (User.username == username) | (User.email == email)
+        ).first()
         
-        if User.query.filter_by(email=email).first():
-            flash('Email already exists.', 'danger')
+        if existing:
+            if existing.username == username:
+                flash('Username already exists.', 'danger')
+            else:
+                flash('Email already exists.', 'danger')
             return redirect(url_for('signup'))
         
         user = User(username=username, email=email)
@@ -179,7 +293,7 @@ def login():
             flash('Logged in successfully!', 'success')
             
             from models import UserFinancialProfile
-            has_profile = UserFinancialProfile.query.filter_by(user_id=user.id).first()
+            has_profile = db.session.query(UserFinancialProfile.id).filter_by(user_id=user.id).first()
             if not has_profile:
                 return redirect(url_for('financial_survey'))
             return redirect(url_for('dashboard'))
@@ -198,55 +312,35 @@ def login():
 
 @app.route('/logout')
 def logout():
-    session.clear()
+    # Drop only the auth keys; the language preference survives logout
+    session.pop('user_id', None)
+    session.pop('username', None)
     flash('Logged out successfully.', 'success')
     return redirect(url_for('login'))
 
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    from sqlalchemy.orm import joinedload
-    from sqlalchemy import func, case
-    
-    user = User.query.get(session['user_id'])
-    memberships = Member.query.options(joinedload(Member.group)).filter_by(
+    user = current_user()
+    if user is None:
+        return login_redirect()
+    # dashboard.html reads membership.group and group.tradition; both are many-to-one, so joining
+    # them brings memberships, groups and their running totals back in a single round trip
+    memberships = Member.query.options(*eager_load(
+        joinedload(Member.group).joinedload(Group.tradition)
+    )).filter_by(
         user_id=user.id, 
         is_active=True
     ).all()
     
-    group_ids = [m.group_id for m in memberships]
-    
-    group_stats = db.session.query(
-        Transaction.group_id,
-        func.sum(case((Transaction.transaction_type == 'contribution', Transaction.amount), else_=0)).label('total_contributions'),
-        func.sum(case((Transaction.transaction_type == 'payout', Transaction.amount), else_=0)).label('total_payouts')
-    ).filter(
-        Transaction.group_id.in_(group_ids)
-    ).group_by(Transaction.group_id).all()
-    
-    stats_dict = {stat.group_id: {'contributions': float(stat.total_contributions or 0), 'payouts': float(stat.total_payouts or 0)} for stat in group_stats}
-    
-    member_counts = db.session.query(
-        Member.group_id,
-        func.count(Member.id).label('count')
-    ).filter(
-        Member.group_id.in_(group_ids),
-        Member.is_active == True
-    ).group_by(Member.group_id).all()
-    
-    counts_dict = {mc.group_id: mc.count for mc in member_counts}
-    
     groups_data = []
     for membership in memberships:
         group = membership.group
-        stats = stats_dict.get(group.id, {'contributions': 0, 'payouts': 0})
-        balance = stats['contributions'] - stats['payouts']
-        
         groups_data.append({
             'group': group,
             'membership': membership,
-            'balance': balance,
-            'members_count': counts_dict.get(group.id, 0)
+            'balance': group.balance,
+            'members_count': group.member_count
         })
     
     language = session.get('language', 'en')
@@ -257,7 +351,7 @@ def dashboard():
     ).order_by(UserBadge.earned_at.desc()).limit(3).all()
     
     from models import UserFinancialProfile
-    has_survey = UserFinancialProfile.query.filter_by(user_id=user.id).first() is not None
+    has_survey = db.session.query(UserFinancialProfile.id).filter_by(user_id=user.id).first() is not None
     
     return render_template('dashboard.html', 
                           groups_data=groups_data, 
@@ -272,7 +366,9 @@ def dashboard():
 def impact_visualizer():
     from sqlalchemy import func
     
-    user = db.session.get(User, session['user_id'])
+    user = current_user()
+    if user is None:
+        return login_redirect()
     language = session.get('language', 'en')
     
     user_memberships = Member.query.filter_by(user_id=user.id, is_active=True).all()
@@ -396,8 +492,6 @@ def create_group():
         tradition_id = request.form.get('tradition_id')
         require_approval = request.form.get('require_admin_approval') == 'on'
         
-        group_code = secrets.token_hex(4).upper()
-        
         tradition = None
         cultural_theme = 'default'
         if tradition_id and tradition_id != '':
@@ -411,25 +505,31 @@ def create_group():
             description=description,
             contribution_amount=contribution_amount,
             contribution_frequency=contribution_frequency,
-            group_code=group_code,
             created_by=session['user_id'],
             tradition_id=int(tradition_id) if tradition_id and tradition_id != '' else None,
             cultural_theme=cultural_theme,
             require_admin_approval=require_approval
         )
-        db.session.add(group)
-        db.session.flush()
-        
-        member = Member(user_id=session['user_id'], group_id=group.id, role='admin')
-        db.session.add(member)
-        db.session.commit()
+        group.members.append(Member(user_id=session['user_id'], role='admin'))
+        
+        # The unique constraint on group_code catches collisions; retry with a fresh code
+        for attempt in range(GROUP_CODE_ATTEMPTS):
+            group.group_code = generate_group_code()
+            db.session.add(group)
+            try:
+                db.session.commit()
+                break
+            except IntegrityError:
+                db.session.rollback()
+        else:
+            flash('Could not generate a unique group code. Please try again.', 'danger')
+            return redirect(url_for('create_group'))
         
         tradition_name = tradition.display_name if tradition else 'Savings Group'
-        flash(f'{tradition_name} created successfully! Group code: {group_code}', 'success')
+        flash(f'{tradition_name} created successfully! Group code: {group.group_code}', 'success')
         return redirect(url_for('group_detail', group_id=group.id))
     
-    from models import Tradition
-    traditions = Tradition.query.all()
+    traditions = get_all_traditions()
     language = session.get('language', 'en')
     t = get_all_ui_texts(language)
     languages = get_language_options()
@@ -464,7 +564,6 @@ def join_group():
                 existing_member.is_active = True
                 existing_member.approval_status = 'approved'
                 flash('Rejoined group successfully!', 'success')
-            db.session.commit()
         else:
             if group.require_admin_approval:
                 member = Member(user_id=session['user_id'], group_id=group.id, role='member', 
@@ -475,7 +574,8 @@ def join_group():
                               approval_status='approved', is_active=True)
                 flash('Joined group successfully!', 'success')
             db.session.add(member)
-            db.session.commit()
+        
+        db.session.commit()
         
         return redirect(url_for('group_detail', group_id=group.id))
     
@@ -491,22 +591,20 @@ def group_detail(group_id):
         flash('You are not a member of this group.', 'danger')
         return redirect(url_for('dashboard'))
     
-    from sqlalchemy.orm import joinedload
     from sqlalchemy import func, case
     
-    members = Member.query.options(joinedload(Member.user)).filter_by(
+    # group_detail.html reads member.user
+    members = Member.query.options(*eager_load(selectinload(Member.user))).filter_by(
         group_id=group_id, 
         is_active=True
     ).all()
     
-    member_ids = [m.id for m in members]
-    
     transaction_stats = db.session.query(
         Transaction.member_id,
         func.sum(case((Transaction.transaction_type == 'contribution', Transaction.amount), else_=0)).label('total_contributed'),
         func.sum(case((Transaction.transaction_type == 'payout', Transaction.amount), else_=0)).label('total_received')
     ).filter(
-        Transaction.member_id.in_(member_ids)
+        Transaction.group_id == group_id
     ).group_by(Transaction.member_id).all()
     
     stats_dict = {
@@ -531,25 +629,30 @@ def group_detail(group_id):
 @login_required
 def add_transaction(group_id):
     group = Group.query.get_or_404(group_id)
-    membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id, is_active=True).first()
+    is_member = db.session.query(Member.id).filter_by(user_id=session['user_id'], group_id=group_id, is_active=True).first()
     
-    if not membership:
+    if not is_member:
         flash('You are not a member of this group.', 'danger')
         return redirect(url_for('dashboard'))
     
     transaction_type = request.form.get('transaction_type')
-    amount = float(request.form.get('amount'))
     description = request.form.get('description')
-    member_id = int(request.form.get('member_id'))
+    try:
+        amount = Decimal(request.form.get('amount')).quantize(CENTS)
+        member_id = int(request.form.get('member_id'))
+    except (TypeError, ValueError, InvalidOperation):
+        amount = None
+    
+    # NaN survives quantize() and would poison the group's running totals
+    if amount is None or not amount.is_finite() or not 0 < amount <= MAX_TRANSACTION_AMOUNT:
+        flash('Please enter a valid amount.', 'danger')
+        return redirect(url_for('ledger', group_id=group_id))
     
     receipt_filename = None
     if 'receipt' in request.files:
         file = request.files['receipt']
         if file and file.filename and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            receipt_filename = f"{timestamp}_{filename}"
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], receipt_filename))
+            receipt_filename = save_receipt(file)
     
     transaction = Transaction(
         group_id=group_id,
@@ -561,33 +664,30 @@ def add_transaction(group_id):
         verified=True if receipt_filename else False
     )
     db.session.add(transaction)
-    db.session.commit()
     
     member = Member.query.get(member_id)
     
-    active_members = Member.query.filter_by(group_id=group_id, is_active=True).all()
-    for active_member in active_members:
-        if transaction_type == 'contribution':
-            send_contribution_notification(
-                active_member.user.email,
-                group.name,
-                amount,
-                member.user.username
-            )
-        else:
-            send_payout_notification(
-                active_member.user.email,
-                group.name,
-                amount,
-                member.user.username
-            )
-    
     streak_days = update_streak(member.user_id)
     xp_data = award_xp(member.user_id, 10, "contribution")
     check_challenge_progress(member.user_id)
     
     awarded_badges = check_and_award_badges(member.user_id)
     
+    # The transaction, XP, streak, challenge and badge updates land in one commit
+    db.session.commit()
+    
+    # Only the addresses are needed, so select the one column rather than loading each member's user
+    recipient_emails = [email for (email,) in db.session.query(User.email).join(
+        Member, Member.user_id == User.id
+    ).filter(Member.group_id == group_id, Member.is_active == True).order_by(Member.id)]
+    notify_group_transaction(
+        recipient_emails,
+        transaction_type,
+        group.name,
+        amount,
+        member.user.username
+    )
+    
     message_parts = ['Transaction recorded!']
     if xp_data['leveled_up']:
         message_parts.append(f"⬆️ Level {xp_data['current_level']}!")
@@ -597,20 +697,80 @@ def add_transaction(group_id):
     
     if awarded_badges:
         badge_names = ', '.join([b.name for b in awarded_badges])
-        for badge in awarded_badges:
-            send_badge_notification(member.user.email, badge.name, badge.description)
+        notify_badges_earned(member.user.email, [(b.name, b.description) for b in awarded_badges])
         message_parts.append(f"🎉 Badges: {badge_names}")
     
     flash(' '.join(message_parts), 'success')
     
     return redirect(url_for('ledger', group_id=group_id))
 
+@app.route('/group/<int:group_id>/add-transactions', methods=['POST'])
+@login_required
+@csrf.exempt
+def add_transactions(group_id):
+    """Record a batch of transactions in a single INSERT and commit"""
+    # Like the other JSON APIs this skips the form CSRF token; insisting on an
+    # application/json body keeps cross-site form posts out, since browsers
+    # preflight that content type
+    if not request.is_json:
+        return jsonify({'error': 'Expected an application/json body'}), 415
+    
+    Group.query.get_or_404(group_id)
+    is_member = db.session.query(Member.id).filter_by(user_id=session['user_id'], group_id=group_id, is_active=True).first()
+    
+    if not is_member:
+        return jsonify({'error': 'You are not a member of this group.'}), 403
+    
+    entries = request.get_json(silent=True)
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'Expected a non-empty list of transactions'}), 400
+    if len(entries) > MAX_BATCH_TRANSACTIONS:
+        return jsonify({'error': f'At most {MAX_BATCH_TRANSACTIONS} transactions per batch'}), 400
+    
+    active_member_ids = {
+        member_id for (member_id,) in db.session.query(Member.id).filter_by(group_id=group_id, is_active=True)
+    }
+    
+    rows = []
+    totals = defaultdict(Decimal)
+    for index, entry in enumerate(entries):
+        try:
+            transaction_type = entry['transaction_type']
+            amount = Decimal(str(entry['amount'])).quantize(CENTS)
+            member_id = int(entry['member_id'])
+            description = entry.get('description')
+        except (KeyError, TypeError, ValueError, InvalidOperation):
+            return jsonify({'error': f'Transaction {index} is missing a valid type, amount or member_id'}), 400
+        
+        # NaN survives quantize() and would raise on comparison, so check it first
+        if (not isinstance(transaction_type, str) or transaction_type not in GROUP_TOTAL_COLUMNS
+                or not amount.is_finite() or not 0 < amount <= MAX_TRANSACTION_AMOUNT
+                or member_id not in active_member_ids
+                or not (description is None or isinstance(description, str))):
+            return jsonify({'error': f'Transaction {index} is invalid'}), 400
+        
+        rows.append({
+            'group_id': group_id,
+            'member_id': member_id,
+            'transaction_type': transaction_type,
+            'amount': amount,
+            'description': description
+        })
+        totals[transaction_type] += amount
+    
+    # Core executemany skips the per-object unit of work (and its flush events),
+    # so the group's running totals are adjusted here in the same transaction
+    connection = db.session.connection()
+    connection.execute(Transaction.__table__.insert(), rows)
+    for transaction_type, total in totals.items():
+        adjust_group_column(connection, group_id, GROUP_TOTAL_COLUMNS[transaction_type], total)
+    db.session.commit()
+    
+    return jsonify({'success': True, 'count': len(rows)})
+
 @app.route('/group/<int:group_id>/ledger')
 @login_required
 def ledger(group_id):
-    from sqlalchemy.orm import joinedload
-    from sqlalchemy import func, case
-    
     group = Group.query.get_or_404(group_id)
     membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id, is_active=True).first()
     
@@ -618,32 +778,51 @@ def ledger(group_id):
         flash('You are not a member of this group.', 'danger')
         return redirect(url_for('dashboard'))
     
-    transactions = Transaction.query.options(
-        joinedload(Transaction.member).joinedload(Member.user)
-    ).filter_by(group_id=group_id).order_by(Transaction.transaction_date.desc()).all()
-    
-    members = Member.query.options(joinedload(Member.user)).filter_by(
+    # Keyset pagination on (transaction_date, id) keeps each page an index range scan
+    # ledger.html reads transaction.member.user and member.user; selectin fetches each
+    # distinct member and user once instead of repeating their columns on every row
+    page_query = Transaction.query.options(*eager_load(
+        selectinload(Transaction.member).selectinload(Member.user)
+    )).filter(Transaction.group_id == group_id)
+    
+    before = request.args.get('before')
+    before_id = request.args.get('before_id', type=int)
+    if before and before_id:
+        try:
+            cursor_date = datetime.fromisoformat(before)
+        except ValueError:
+            cursor_date = None
+        if cursor_date:
+            page_query = page_query.filter(or_(
+                Transaction.transaction_date < cursor_date,
+                and_(Transaction.transaction_date == cursor_date, Transaction.id < before_id)
+            ))
+    
+    transactions = page_query.order_by(
+        Transaction.transaction_date.desc(), Transaction.id.desc()
+    ).limit(LEDGER_PAGE_SIZE + 1).all()
+    
+    next_cursor = None
+    if len(transactions) > LEDGER_PAGE_SIZE:
+        transactions = transactions[:LEDGER_PAGE_SIZE]
+        last = transactions[-1]
+        next_cursor = {'before': last.transaction_date.isoformat(), 'before_id': last.id}
+    
+    members = Member.query.options(*eager_load(joinedload(Member.user))).filter_by(
         group_id=group_id, 
         is_active=True
     ).all()
     
-    totals = db.session.query(
-        func.sum(case((Transaction.transaction_type == 'contribution', Transaction.amount), else_=0)).label('contributions'),
-        func.sum(case((Transaction.transaction_type == 'payout', Transaction.amount), else_=0)).label('payouts')
-    ).filter(Transaction.group_id == group_id).first()
-    
-    total_contributions = float(totals.contributions or 0)
-    total_payouts = float(totals.payouts or 0)
-    balance = total_contributions - total_payouts
-    
     return render_template('ledger.html', 
                           group=group, 
                           membership=membership,
                           transactions=transactions, 
                           members=members,
-                          total_contributions=total_contributions,
-                          total_payouts=total_payouts,
-                          balance=balance)
+                          next_cursor=next_cursor,
+                          is_first_page=not before,
+                          total_contributions=group.total_contributions,
+                          total_payouts=group.total_payouts,
+                          balance=group.balance)
 
 @app.route('/group/<int:group_id>/unsubscribe', methods=['POST'])
 @login_required
@@ -660,22 +839,26 @@ def unsubscribe(group_id):
 @app.route('/admin-dashboard')
 @login_required
 def admin_dashboard():
-    admin_groups = Member.query.filter_by(user_id=session['user_id'], role='admin', is_active=True).all()
+    # admin_dashboard.html reads membership.group, pending.group and pending.user
+    admin_groups = Member.query.options(*eager_load(selectinload(Member.group))).filter_by(
+        user_id=session['user_id'], role='admin', is_active=True
+    ).all()
+    admin_group_ids = [m.group_id for m in admin_groups]
     
     pending_approvals = []
-    for admin_membership in admin_groups:
-        group = admin_membership.group
-        pending_members = Member.query.filter_by(
-            group_id=group.id,
-            approval_status='pending'
-        ).all()
-        
-        for pending in pending_members:
-            pending_approvals.append({
-                'member': pending,
-                'group': group,
-                'user': pending.user
-            })
+    if admin_group_ids:
+        pending_members = Member.query.options(*eager_load(
+            joinedload(Member.user), joinedload(Member.group)
+        )).filter(
+            Member.group_id.in_(admin_group_ids),
+            Member.approval_status == 'pending'
+        ).order_by(Member.group_id, Member.joined_at).all()
+        
+        pending_approvals = [{
+            'member': pending,
+            'group': pending.group,
+            'user': pending.user
+        } for pending in pending_members]
     
     language = session.get('language', 'en')
     proverb = get_random_proverb(language)
@@ -685,21 +868,29 @@ def admin_dashboard():
                           proverb=proverb,
                           language=language)
 
+def admin_group_name(group_id):
+    """The group's name if the signed-in user administers it, else None; one indexed lookup, no ORM rows"""
+    return db.session.query(Group.name).join(Member, Member.group_id == Group.id).filter(
+        Group.id == group_id,
+        Member.user_id == session['user_id'],
+        Member.role == 'admin'
+    ).scalar()
+
 @app.route('/group/<int:group_id>/approve-member/<int:member_id>', methods=['POST'])
 @login_required
 def approve_member(group_id, member_id):
-    admin_membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id, role='admin').first()
+    group_name = admin_group_name(group_id)
     
-    if not admin_membership:
+    if group_name is None:
         flash('Only admins can approve members.', 'danger')
         return redirect(url_for('dashboard'))
     
-    member = Member.query.get_or_404(member_id)
+    member = Member.query.filter_by(id=member_id, group_id=group_id).first_or_404()
     member.approval_status = 'approved'
     member.is_active = True
     db.session.commit()
     
-    send_approval_notification(member.user.email, admin_membership.group.name, approved=True)
+    send_approval_notification(member.user.email, group_name, approved=True)
     
     flash(f'{member.user.username} has been approved!', 'success')
     return redirect(request.referrer or url_for('admin_dashboard'))
@@ -707,16 +898,15 @@ def approve_member(group_id, member_id):
 @app.route('/group/<int:group_id>/reject-member/<int:member_id>', methods=['POST'])
 @login_required
 def reject_member(group_id, member_id):
-    admin_membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id, role='admin').first()
+    group_name = admin_group_name(group_id)
     
-    if not admin_membership:
+    if group_name is None:
         flash('Only admins can reject members.', 'danger')
         return redirect(url_for('dashboard'))
     
-    member = Member.query.get_or_404(member_id)
+    member = Member.query.filter_by(id=member_id, group_id=group_id).first_or_404()
     username = member.user.username
     user_email = member.user.email
-    group_name = admin_membership.group.name
     db.session.delete(member)
     db.session.commit()
     
@@ -728,25 +918,25 @@ def reject_member(group_id, member_id):
 @app.route('/group/<int:group_id>/export-report')
 @login_required
 def export_report(group_id):
-    membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id).first()
+    is_member = db.session.query(Member.id).filter_by(user_id=session['user_id'], group_id=group_id).first()
     
-    if not membership:
+    if not is_member:
         flash('Access denied.', 'danger')
         return redirect(url_for('dashboard'))
     
-    csv_data = generate_group_report_csv(group_id)
     group = Group.query.get_or_404(group_id)
     filename = f"{group.name.replace(' ', '_')}_report_{datetime.utcnow().strftime('%Y%m%d')}.csv"
     
     return Response(
-        csv_data,
+        stream_with_context(iter_group_report_csv(group)),
         mimetype='text/csv',
-        headers={'Content-Disposition': f'attachment;filename={filename}'}
+        # Stop nginx from buffering the whole export before the first byte reaches the client
+        headers={'Content-Disposition': f'attachment;filename={filename}', 'X-Accel-Buffering': 'no'}
     )
 
 def calculate_reputation_score(user_id):
     """Calculate user reputation score (0-100) based on activity"""
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return {'total': 0, 'consistency': 0, 'activity': 0}
     
@@ -783,11 +973,14 @@ def calculate_reputation_score(user_id):
 @app.route('/my-badges')
 @login_required
 def my_badges():
-    user = User.query.get(session['user_id'])
-    user_badges = UserBadge.query.filter_by(user_id=user.id).all()
-    all_badges = Badge.query.all()
+    user = current_user()
+    if user is None:
+        return login_redirect()
+    user_badges = UserBadge.query.options(*eager_load(joinedload(UserBadge.badge))).filter_by(user_id=user.id).all()
     
-    earned_badge_ids = [ub.badge_id for ub in user_badges]
+    # Badge definitions are cached in memory, so the locked list is a set difference, not another query
+    earned_badge_ids = {ub.badge_id for ub in user_badges}
+    unearned_badges = [badge for badge in get_all_badges() if badge.id not in earned_badge_ids]
     
     reputation_data = calculate_reputation_score(user.id)
     
@@ -799,8 +992,7 @@ def my_badges():
     
     return render_template('badges.html', 
                           user_badges=user_badges,
-                          all_badges=all_badges,
-                          earned_badge_ids=earned_badge_ids,
+                          unearned_badges=unearned_badges,
                           reputation_score=reputation_data['total'],
                           consistency_score=reputation_data['consistency'],
                           activity_score=reputation_data['activity'],
@@ -812,15 +1004,23 @@ def my_badges():
 @app.route('/uploads/receipts/<filename>')
 @login_required
 def uploaded_file(filename):
-    from flask import send_from_directory
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    accel_prefix = app.config['RECEIPTS_ACCEL_PREFIX']
+    if not accel_prefix:
+        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    
+    # Python only authorizes the request; nginx streams the file with sendfile
+    if safe_join(app.config['UPLOAD_FOLDER'], filename) is None:
+        abort(404)
+    response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+    return response
 
 @app.route('/admin/cleanup-receipts', methods=['POST'])
 @login_required
 def cleanup_receipts():
-    admin_groups = Member.query.filter_by(user_id=session['user_id'], role='admin', is_active=True).first()
+    is_admin = db.session.query(Member.id).filter_by(user_id=session['user_id'], role='admin', is_active=True).first()
     
-    if not admin_groups:
+    if not is_admin:
         flash('Only admins can perform cleanup operations.', 'danger')
         return redirect(url_for('dashboard'))
     
@@ -841,7 +1041,6 @@ def cleanup_receipts():
 @login_required
 def leaderboard():
     from models import UserXP
-    from sqlalchemy.orm import joinedload
     
     try:
         top_users = UserXP.query.options(
@@ -894,8 +1093,8 @@ def financial_survey():
     """Display financial survey questionnaire"""
     from models import UserFinancialProfile
     
-    existing_profile = UserFinancialProfile.query.filter_by(user_id=session['user_id']).first()
-    if existing_profile:
+    has_profile = db.session.query(UserFinancialProfile.id).filter_by(user_id=session['user_id']).first()
+    if has_profile:
         flash('You have already completed the financial survey. View your recommendations below.', 'info')
         return redirect(url_for('survey_results'))
     
@@ -933,7 +1132,7 @@ def submit_financial_survey():
 @login_required
 def survey_results():
     """Display personalized group recommendations based on survey"""
-    from models import UserFinancialProfile, Tradition
+    from models import UserFinancialProfile
     
     profile = UserFinancialProfile.query.filter_by(user_id=session['user_id']).first()
     
@@ -941,14 +1140,6 @@ def survey_results():
         flash('Please complete the financial survey first to get personalized recommendations.', 'warning')
         return redirect(url_for('financial_survey'))
     
-    recommended_groups = Group.query.filter(
-        Group.id.in_(
-            db.session.query(Member.group_id)
-            .filter(Member.user_id != session['user_id'])
-            .distinct()
-        )
-    ).limit(10).all()
-    
     contribution_ranges = {
         'under_50': (0, 50),
         '50_100': (50, 100),
@@ -959,18 +1150,23 @@ def survey_results():
     
     min_amount, max_amount = contribution_ranges.get(profile.contribution_comfort_level, (0, 10000))
     
-    matched_groups = []
-    for group in recommended_groups:
-        if min_amount <= group.contribution_amount <= max_amount:
-            matched_groups.append(group)
+    # Filter by amount in SQL so the LIMIT applies to groups that actually match
+    matched_groups = Group.query.options(joinedload(Group.tradition)).filter(
+        Group.contribution_amount.between(min_amount, max_amount),
+        Group.id.in_(
+            db.session.query(Member.group_id)
+            .filter(Member.user_id != session['user_id'])
+            .distinct()
+        )
+    ).limit(5).all()
     
-    traditions = Tradition.query.all()
+    traditions = get_all_traditions()
     
     insights = generate_financial_insights(profile)
     
     return render_template('survey_results.html',
                           profile=profile,
-                          matched_groups=matched_groups[:5],
+                          matched_groups=matched_groups,
                           traditions=traditions,
                           insights=insights)
 
@@ -1027,41 +1223,41 @@ def generate_financial_insights(profile):
 @login_required
 def add_ghost_user(group_id):
     """Add a ghost (placeholder) user to a group for balanced rotations"""
-    from models import Member
-    import uuid
-    
-    group = Group.query.get_or_404(group_id)
-    membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id).first()
-    
-    if not membership or membership.role != 'admin':
+    # One round-trip: 404 for an unknown group, the caller's role (None when not a member) otherwise
+    guard = db.session.query(Group.id, Member.role).outerjoin(
+        Member, and_(Member.group_id == Group.id, Member.user_id == session['user_id'])
+    ).filter(Group.id == group_id).first()
+    if guard is None:
+        abort(404)
+    
+    if guard.role != 'admin':
         flash('Only group admins can add ghost users.', 'danger')
         return redirect(url_for('group_detail', group_id=group_id))
     
     ghost_name = request.form.get('ghost_name', 'Placeholder')
-    ghost_uuid = str(uuid.uuid4())[:8]
+    # 64 random bits keep the unique username and email collision-free without counting existing ghosts
+    ghost_token = secrets.token_hex(8)
     
     ghost_user = User(
-        username=f"ghost-{ghost_uuid}",
-        email=f"ghost-{ghost_uuid}@tikob.internal",
+        username=f"ghost-{ghost_token}",
+        email=f"ghost-{ghost_token}@tikob.internal",
         is_ghost=True,
         notification_enabled=False
     )
-    ghost_user.set_password(str(uuid.uuid4()))
-    
-    db.session.add(ghost_user)
-    db.session.flush()
+    # Ghosts can never sign in, so there is no password worth running the hash for
+    ghost_user.set_unusable_password()
     
-    ghost_member = Member(
-        user_id=ghost_user.id,
+    # Attached through the relationship, so one flush inserts both rows and fills in user_id
+    ghost_user.memberships.append(Member(
         group_id=group_id,
         role='member',
         is_active=True,
         is_ghost=True,
         reliability_score=0,
         approval_status='approved'
-    )
+    ))
     
-    db.session.add(ghost_member)
+    db.session.add(ghost_user)
     db.session.commit()
     
     flash(f'Ghost user "{ghost_name}" added successfully. You can use this for rotation balancing.', 'success')
@@ -1071,16 +1267,24 @@ def add_ghost_user(group_id):
 @login_required
 def remove_ghost_user(group_id, member_id):
     """Remove a ghost user from a group"""
-    from models import Member
-    
-    group = Group.query.get_or_404(group_id)
-    admin_membership = Member.query.filter_by(user_id=session['user_id'], group_id=group_id).first()
-    
-    if not admin_membership or admin_membership.role != 'admin':
+    # The group, the caller's role and the target member come back together; the target must
+    # belong to this group, so admins of one group cannot remove another group's members
+    target = aliased(Member)
+    guard = db.session.query(Group.id, Member.role, target).outerjoin(
+        Member, and_(Member.group_id == Group.id, Member.user_id == session['user_id'])
+    ).outerjoin(
+        target, and_(target.group_id == Group.id, target.id == member_id)
+    ).filter(Group.id == group_id).first()
+    if guard is None:
+        abort(404)
+    _, role, ghost_member = guard
+    
+    if role != 'admin':
         flash('Only group admins can remove ghost users.', 'danger')
         return redirect(url_for('group_detail', group_id=group_id))
     
-    ghost_member = Member.query.get_or_404(member_id)
+    if ghost_member is None:
+        abort(404)
     
     if not ghost_member.is_ghost:
         flash('This is not a ghost user.', 'danger')
@@ -1092,40 +1296,51 @@ def remove_ghost_user(group_id, member_id):
     flash('Ghost user removed successfully.', 'success')
     return redirect(url_for('group_detail', group_id=group_id))
 
+def get_plaid_client():
+    """Shared PlaidApi for the configured environment, or None when the keys are missing"""
+    plaid_client_id = os.getenv('PLAID_CLIENT_ID')
+    plaid_secret = os.getenv('PLAID_SECRET')
+    if not plaid_client_id or not plaid_secret:
+        return None
+    return build_plaid_client(plaid_client_id, plaid_secret, os.getenv('PLAID_ENV', 'sandbox'))
+
+@lru_cache(maxsize=4)
+def build_plaid_client(plaid_client_id, plaid_secret, plaid_env):
+    """Built once per credentials and environment so requests reuse its connection pool"""
+    import plaid
+    from plaid.api import plaid_api
+    from urllib3.util import Retry
+    
+    host = plaid.Environment.Sandbox if plaid_env == 'sandbox' else plaid.Environment.Production
+    
+    configuration = plaid.Configuration(
+        host=host,
+        api_key={
+            'clientId': plaid_client_id,
+            'secret': plaid_secret,
+            'plaidVersion': '2020-09-14'
+        }
+    )
+    # Retry dropped connections on the pooled client rather than failing the request;
+    # urllib3 does not replay POSTs that already reached Plaid
+    configuration.retries = Retry(total=2, backoff_factor=0.1)
+    
+    return plaid_api.PlaidApi(plaid.ApiClient(configuration))
+
 @app.route('/plaid/create-link-token', methods=['POST'])
 @login_required
 def create_plaid_link_token():
     """Create Plaid Link token for bank account linking"""
     try:
-        import plaid
-        from plaid.api import plaid_api
         from plaid.model.link_token_create_request import LinkTokenCreateRequest
         from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
         from plaid.model.products import Products
         from plaid.model.country_code import CountryCode
-        import os
-        
-        plaid_client_id = os.getenv('PLAID_CLIENT_ID')
-        plaid_secret = os.getenv('PLAID_SECRET')
-        plaid_env = os.getenv('PLAID_ENV', 'sandbox')
         
-        if not plaid_client_id or not plaid_secret:
+        client = get_plaid_client()
+        if client is None:
             return jsonify({'error': 'Plaid API keys not configured'}), 400
         
-        host = plaid.Environment.Sandbox if plaid_env == 'sandbox' else plaid.Environment.Production
-        
-        configuration = plaid.Configuration(
-            host=host,
-            api_key={
-                'clientId': plaid_client_id,
-                'secret': plaid_secret,
-                'plaidVersion': '2020-09-14'
-            }
-        )
-        
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
-        
         link_request = LinkTokenCreateRequest(
             products=[Products('transactions'), Products('auth')],
             client_name="TiKòb - Community Savings",
@@ -1147,11 +1362,7 @@ def create_plaid_link_token():
 def exchange_plaid_token():
     """Exchange Plaid public token for access token"""
     try:
-        import plaid
-        from plaid.api import plaid_api
         from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-        from models import PlaidAccount
-        import os
         
         public_token = request.json.get('public_token')
         institution_name = request.json.get('institution_name', 'Bank')
@@ -1159,23 +1370,9 @@ def exchange_plaid_token():
         if not public_token:
             return jsonify({'error': 'Public token required'}), 400
         
-        plaid_client_id = os.getenv('PLAID_CLIENT_ID')
-        plaid_secret = os.getenv('PLAID_SECRET')
-        plaid_env = os.getenv('PLAID_ENV', 'sandbox')
-        
-        host = plaid.Environment.Sandbox if plaid_env == 'sandbox' else plaid.Environment.Production
-        
-        configuration = plaid.Configuration(
-            host=host,
-            api_key={
-                'clientId': plaid_client_id,
-                'secret': plaid_secret,
-                'plaidVersion': '2020-09-14'
-            }
-        )
-        
-        api_client = plaid.ApiClient(configuration)
-        client = plaid_api.PlaidApi(api_client)
+        client = get_plaid_client()
+        if client is None:
+            return jsonify({'error': 'Plaid API keys not configured'}), 400
         
         exchange_request = ItemPublicTokenExchangeRequest(public_token=public_token)
         exchange_response = client.item_public_token_exchange(exchange_request)
@@ -1200,33 +1397,72 @@ def exchange_plaid_token():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+# money_management statements are built once; each request only binds user_id and since,
+# so SQLAlchemy serves them from its compiled cache without rebuilding the expression tree
+ACTIVE_PLAID_ACCOUNTS = select(PlaidAccount).where(
+    PlaidAccount.user_id == bindparam('user_id'),
+    PlaidAccount.is_active == True
+)
+
+# Only the columns money_management.html shows, as plain rows rather than ORM objects
+RECENT_PERSONAL_TRANSACTIONS = select(
+    PersonalTransaction.id,
+    PersonalTransaction.transaction_date,
+    PersonalTransaction.description,
+    PersonalTransaction.merchant_name,
+    PersonalTransaction.category,
+    PersonalTransaction.amount,
+    PersonalTransaction.is_income
+).where(
+    PersonalTransaction.user_id == bindparam('user_id'),
+    PersonalTransaction.transaction_date >= bindparam('since')
+).order_by(PersonalTransaction.transaction_date.desc()).limit(50)
+
+# Income and expenses for the window in one pass
+PERSONAL_CASHFLOW_TOTALS = select(
+    func.coalesce(func.sum(case((PersonalTransaction.is_income == True, PersonalTransaction.amount))), 0),
+    func.coalesce(func.sum(case((PersonalTransaction.is_income == False, PersonalTransaction.amount))), 0)
+).where(
+    PersonalTransaction.user_id == bindparam('user_id'),
+    PersonalTransaction.transaction_date >= bindparam('since')
+)
+
+# Coalesces money_management reloads: user_id -> (expires_at, (total_income, total_expenses))
+CASHFLOW_CACHE_TTL = 300
+CASHFLOW_CACHE_MAX_USERS = 10000
+cashflow_cache = {}
+
+def get_cashflow_totals(params):
+    """30-day income and expense totals, re-aggregated at most every CASHFLOW_CACHE_TTL seconds"""
+    cached = cashflow_cache.get(params['user_id'])
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    totals = tuple(db.session.execute(PERSONAL_CASHFLOW_TOTALS, params).one())
+    
+    if len(cashflow_cache) >= CASHFLOW_CACHE_MAX_USERS:
+        cashflow_cache.clear()
+    cashflow_cache[params['user_id']] = (time.monotonic() + CASHFLOW_CACHE_TTL, totals)
+    return totals
+
+@event.listens_for(PersonalTransaction, 'after_insert')
+@event.listens_for(PersonalTransaction, 'after_update')
+@event.listens_for(PersonalTransaction, 'after_delete')
+def invalidate_cashflow_totals(mapper, connection, target):
+    """Drop the owner's cached totals when one of their transactions changes in this process"""
+    cashflow_cache.pop(target.user_id, None)
+
 @app.route('/money-management')
 @login_required
 def money_management():
     """Personal money management dashboard"""
-    from models import PlaidAccount, PersonalTransaction
-    from sqlalchemy import func
-    from datetime import datetime, timedelta
-    
-    plaid_accounts = PlaidAccount.query.filter_by(user_id=session['user_id'], is_active=True).all()
+    params = {'user_id': session['user_id'], 'since': datetime.utcnow() - timedelta(days=30)}
     
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_transactions = PersonalTransaction.query.filter(
-        PersonalTransaction.user_id == session['user_id'],
-        PersonalTransaction.transaction_date >= thirty_days_ago
-    ).order_by(PersonalTransaction.transaction_date.desc()).limit(50).all()
+    # money_management.html only reads columns, so no relationships are loaded
+    plaid_accounts = db.session.scalars(ACTIVE_PLAID_ACCOUNTS.options(*eager_load()), params).all()
+    recent_transactions = db.session.execute(RECENT_PERSONAL_TRANSACTIONS, params).all()
     
-    total_income = db.session.query(func.sum(PersonalTransaction.amount)).filter(
-        PersonalTransaction.user_id == session['user_id'],
-        PersonalTransaction.is_income == True,
-        PersonalTransaction.transaction_date >= thirty_days_ago
-    ).scalar() or 0
-    
-    total_expenses = db.session.query(func.sum(PersonalTransaction.amount)).filter(
-        PersonalTransaction.user_id == session['user_id'],
-        PersonalTransaction.is_income == False,
-        PersonalTransaction.transaction_date >= thirty_days_ago
-    ).scalar() or 0
+    total_income, total_expenses = get_cashflow_totals(params)
     
     net_savings = total_income - total_expenses
     
@@ -1244,10 +1480,12 @@ def money_management():
 @app.route('/set-language/<lang>')
 def set_language(lang):
     """Set language - works for logged in and guest users"""
-    if lang in SUPPORTED_LANGUAGES:
+    # Re-selecting the current language leaves the session untouched, so no new cookie is signed
+    if lang in SUPPORTED_LANGUAGES and session.get('language') != lang:
         session['language'] = lang
         if 'user_id' in session:
-            flash(get_community_phrase('welcome', lang if lang in ['en', 'ht'] else 'en'), 'success')
+            # get_community_phrase falls back to English for languages without phrases
+            flash(get_community_phrase('welcome', lang), 'success')
     return redirect(request.referrer or url_for('login'))
 
 @app.route('/group/<int:group_id>/chat')
@@ -1255,9 +1493,9 @@ def set_language(lang):
 def group_chat(group_id):
     """Folkloric group chat page"""
     group = Group.query.get_or_404(group_id)
-    member = Member.query.filter_by(group_id=group_id, user_id=session['user_id'], is_active=True).first()
+    is_member = db.session.query(Member.id).filter_by(group_id=group_id, user_id=session['user_id'], is_active=True).first()
     
-    if not member:
+    if not is_member:
         flash('You must be a member to access this group chat.', 'danger')
         return redirect(url_for('dashboard'))
     
@@ -1266,7 +1504,7 @@ def group_chat(group_id):
     
     language = session.get('language', 'en')
     proverbs = [
-        get_random_proverb(language),
+        get_random_proverb(language)['text'],
         "Unity is strength, division is weakness.",
         "Little by little fills the measure.",
         "Many hands make light work."
@@ -1290,7 +1528,7 @@ def random_proverb_api():
     """API endpoint for random proverbs"""
     language = session.get('language', 'en')
     proverb = get_random_proverb(language)
-    return jsonify({'proverb': proverb})
+    return jsonify({'proverb': dict(proverb)})
 
 @app.route('/api/ai-proverb')
 def ai_proverb_api():
@@ -1337,7 +1575,7 @@ def on_send_message(data):
     proverb_context = data.get('proverb_context')
     
     if group_id and content:
-        user = User.query.get(session['user_id'])
+        user = current_user()
         member = Member.query.filter_by(group_id=group_id, user_id=session['user_id']).first()
         
         if user and member:
@@ -1580,16 +1818,17 @@ def api_finalize_report(report_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+TEMPLATE_HELPERS = {
+    'get_user_initials': get_user_initials,
+    'get_avatar_color': get_avatar_color,
+    'get_community_phrase': get_community_phrase,
+    'get_tradition_theme_colors': get_tradition_theme_colors
+}
+
 @app.context_processor
 def utility_processor():
     """Make utility functions available to all templates"""
-    from traditions_data import get_tradition_theme_colors
-    return {
-        'get_user_initials': get_user_initials,
-        'get_avatar_color': get_avatar_color,
-        'get_community_phrase': get_community_phrase,
-        'get_tradition_theme_colors': get_tradition_theme_colors
-    }
+    return TEMPLATE_HELPERS
 
 # ============== TELLER BANK LINKING ==============
 TELLER_APP_ID = os.environ.get('TELLER_APP_ID')
@@ -1757,8 +1996,6 @@ def upload_audio():
 @login_required
 def serve_audio(filename):
     """Serve uploaded audio files (authenticated)"""
-    from flask import send_from_directory
-    
     safe_filename = secure_filename(filename)
     if safe_filename != filename or not safe_filename:
         return jsonify({'error': 'Invalid filename'}), 400
@@ -1795,7 +2032,7 @@ def on_send_audio_message(data):
     if duration and (not isinstance(duration, (int, float)) or duration > MAX_AUDIO_DURATION):
         duration = min(duration, MAX_AUDIO_DURATION) if isinstance(duration, (int, float)) else 0
     
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     member = Member.query.filter_by(user_id=user_id, group_id=group_id, is_active=True).first()
     
     if not member or not user:
@@ -1823,4 +2060,6 @@ def on_send_audio_message(data):
     }, room=f'group_{group_id}')
 
 if __name__ == '__main__':
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    with app.app_context():
+        init_database()
+    socketio.run(app, host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -2,6 +2,8 @@
 Haitian Cultural Elements
 Proverbs, quotes, and financial wisdom from Haitian culture
 """
+import random
+from types import MappingProxyType
 
 HAITIAN_PROVERBS = [
     {
@@ -142,28 +144,29 @@ COMMUNITY_SAVINGS_PHRASES = {
     }
 }
 
-def get_random_proverb(language='en'):
-    """Get a random Haitian proverb"""
-    import random
-    proverb = random.choice(HAITIAN_PROVERBS)
-    
+def build_proverb_views(language):
+    """Shape every proverb for one display language, once at import"""
     if language == 'ht':
-        return {
+        return tuple(MappingProxyType({
             'text': proverb['creole'],
             'translation': proverb['english'],
             'meaning': proverb.get('meaning', '')
-        }
-    else:
-        return {
-            'text': proverb['english'],
-            'original': proverb['creole'],
-            'meaning': proverb.get('meaning', '')
-        }
+        }) for proverb in HAITIAN_PROVERBS)
+    return tuple(MappingProxyType({
+        'text': proverb['english'],
+        'original': proverb['creole'],
+        'meaning': proverb.get('meaning', '')
+    }) for proverb in HAITIAN_PROVERBS)
+
+PROVERBS_BY_LANGUAGE = {language: build_proverb_views(language) for language in ('en', 'ht')}
+
+def get_random_proverb(language='en'):
+    """Get a random Haitian proverb"""
+    proverbs = PROVERBS_BY_LANGUAGE['ht' if language == 'ht' else 'en']
+    return proverbs[random.randrange(len(proverbs))]
 
 def get_financial_wisdom(category=None, language='en'):
     """Get financial wisdom in Creole or English"""
-    import random
-    
     if category:
         filtered = [w for w in FINANCIAL_WISDOM_CREOLE if w.get('category') == category]
         wisdom = random.choice(filtered) if filtered else random.choice(FINANCIAL_WISDOM_CREOLE)
@@ -0,0 +1,94 @@
+"""Store transaction amounts as numeric, add running totals to group and backfill them
+
+Revision ID: 3f1c9a2d7b40
+Revises:
+Create Date: 2026-10-16 09:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a2d7b40'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+group_table = sa.table(
+    'group',
+    sa.column('id', sa.Integer),
+    sa.column('total_contributions', sa.Numeric(12, 2)),
+    sa.column('total_payouts', sa.Numeric(12, 2)),
+    sa.column('member_count', sa.Integer),
+)
+transaction_table = sa.table(
+    'transaction',
+    sa.column('group_id', sa.Integer),
+    sa.column('transaction_type', sa.String),
+    sa.column('amount', sa.Numeric(12, 2)),
+)
+member_table = sa.table(
+    'member',
+    sa.column('group_id', sa.Integer),
+    sa.column('is_active', sa.Boolean),
+)
+
+
+def group_sum(transaction_type):
+    """SUM(amount) of one transaction type for the outer group row"""
+    return sa.select(sa.func.coalesce(sa.func.sum(transaction_table.c.amount), 0)).where(
+        transaction_table.c.group_id == group_table.c.id,
+        transaction_table.c.transaction_type == transaction_type
+    ).scalar_subquery()
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # A fresh database gets these tables, columns included, from `flask seed`
+    if not inspector.has_table('group'):
+        return
+    amount_type = next(column['type'] for column in inspector.get_columns('transaction') if column['name'] == 'amount')
+    # Float is a Numeric subclass; only the old double precision column needs converting
+    if isinstance(amount_type, sa.Float) or not isinstance(amount_type, sa.Numeric):
+        with op.batch_alter_table('transaction') as batch_op:
+            batch_op.alter_column(
+                'amount',
+                existing_type=amount_type,
+                type_=sa.Numeric(12, 2),
+                existing_nullable=False,
+                postgresql_using='round(amount::numeric, 2)'
+            )
+        # SQLite keeps whatever was stored, so round the old floats to the cent as well
+        op.execute(transaction_table.update().values(amount=sa.func.round(transaction_table.c.amount, 2)))
+
+    existing = {column['name'] for column in inspector.get_columns('group')}
+
+    with op.batch_alter_table('group') as batch_op:
+        if 'total_contributions' not in existing:
+            batch_op.add_column(sa.Column('total_contributions', sa.Numeric(12, 2), nullable=False, server_default='0'))
+        if 'total_payouts' not in existing:
+            batch_op.add_column(sa.Column('total_payouts', sa.Numeric(12, 2), nullable=False, server_default='0'))
+        if 'member_count' not in existing:
+            batch_op.add_column(sa.Column('member_count', sa.Integer(), nullable=False, server_default='0'))
+
+    active_members = sa.select(sa.func.count()).select_from(member_table).where(
+        member_table.c.group_id == group_table.c.id,
+        member_table.c.is_active == sa.true()
+    ).scalar_subquery()
+
+    # Rebuild every counter from the (now exact) rows; the mapper events keep them current afterwards
+    op.execute(group_table.update().values(
+        total_contributions=group_sum('contribution'),
+        total_payouts=group_sum('payout'),
+        member_count=active_members,
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('group') as batch_op:
+        batch_op.drop_column('member_count')
+        batch_op.drop_column('total_payouts')
+        batch_op.drop_column('total_contributions')
+    with op.batch_alter_table('transaction') as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Numeric(12, 2), type_=sa.Float(), existing_nullable=False)
@@ -0,0 +1,89 @@
+"""Convert personalized_advice.context_data from text to JSON
+
+Revision ID: 8b2e5d0c4a17
+Revises: 3f1c9a2d7b40
+Create Date: 2026-10-16 10:40:00.000000
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e5d0c4a17'
+down_revision = '3f1c9a2d7b40'
+branch_labels = None
+depends_on = None
+
+# What generate_personalized_advice used to write: "total_saved: 600.0, recent_contributions: 4"
+LEGACY_CONTEXT = re.compile(r'total_saved:\s*(-?[\d.]+),\s*recent_contributions:\s*(\d+)')
+
+advice_table = sa.table(
+    'personalized_advice',
+    sa.column('id', sa.Integer),
+    sa.column('context_data', sa.Text),
+)
+
+
+def legacy_context_to_json(value):
+    """JSON text for a stored context value, or None when it can't be read"""
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return json.dumps(parsed)
+    match = LEGACY_CONTEXT.fullmatch(value.strip())
+    if not match:
+        return None
+    return json.dumps({'total_saved': float(match.group(1)), 'recent_count': int(match.group(2))})
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('personalized_advice'):
+        return
+
+    if 'ix_advice_context_gin' in {index['name'] for index in inspector.get_indexes('personalized_advice')}:
+        op.drop_index('ix_advice_context_gin', table_name='personalized_advice')
+
+    context_type = next(
+        column['type'] for column in inspector.get_columns('personalized_advice') if column['name'] == 'context_data'
+    )
+    if isinstance(context_type, sa.JSON):
+        return
+
+    # Rewrite the old f-strings as JSON text first so the cast below can't fail;
+    # anything unrecognisable is cleared rather than blocking the upgrade
+    rows = bind.execute(
+        sa.select(advice_table.c.id, advice_table.c.context_data).where(advice_table.c.context_data.is_not(None))
+    ).all()
+    updates = [{'row_id': row.id, 'value': legacy_context_to_json(row.context_data)} for row in rows]
+    if updates:
+        bind.execute(
+            advice_table.update().where(advice_table.c.id == sa.bindparam('row_id')).values(context_data=sa.bindparam('value')),
+            updates
+        )
+
+    with op.batch_alter_table('personalized_advice') as batch_op:
+        batch_op.alter_column(
+            'context_data',
+            existing_type=context_type,
+            type_=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            postgresql_using='context_data::jsonb'
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('personalized_advice') as batch_op:
+        batch_op.alter_column(
+            'context_data',
+            existing_type=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            type_=sa.Text(),
+            postgresql_using='context_data::text'
+        )
@@ -0,0 +1,52 @@
+"""Create the lookup indexes declared on the models
+
+Revision ID: c5d81f3e9a62
+Revises: 8b2e5d0c4a17
+Create Date: 2026-10-16 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d81f3e9a62'
+down_revision = '8b2e5d0c4a17'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, dialect options); create_all only adds these to new tables
+INDEXES = (
+    # group_detail, ledger and the running-total lookups filter transactions and members by group
+    ('ix_member_group_active', 'member', ['group_id', 'is_active'], {}),
+    ('ix_txn_group_type', 'transaction', ['group_id', 'transaction_type'], {}),
+    ('ix_txn_group_date', 'transaction', ['group_id', 'transaction_date'], {}),
+    # advice rotation and the per-member contribution history
+    ('ix_tx_member_type_date', 'transaction', ['member_id', 'transaction_type', 'transaction_date'], {}),
+    ('ix_personalized_advice_user_displayed_created', 'personalized_advice',
+     ['user_id', 'displayed', sa.text('created_at DESC')], {}),
+    # money_management's per-user window; INCLUDE lets Postgres answer the sums from the index
+    ('ix_pt_user_date', 'personal_transaction', ['user_id', 'transaction_date'],
+     {'postgresql_include': ['amount', 'is_income']}),
+    # dashboard and the group guards look up a user's active memberships
+    ('ix_member_user_active', 'member', ['user_id', 'is_active'], {}),
+    # the admin guards only need the role for a (user, group) pair
+    ('ix_member_user_group_role', 'member', ['user_id', 'group_id', 'role'], {}),
+    # admin_dashboard's pending requests per group
+    ('ix_member_group_status', 'member', ['group_id', 'approval_status'], {}),
+    # survey_results filters groups by a contribution range
+    ('ix_group_contribution_amount', 'group', ['contribution_amount'], {}),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, options in INDEXES:
+        # A fresh database gets its tables, indexes included, from `flask seed`
+        if inspector.has_table(table):
+            op.create_index(name, table, columns, if_not_exists=True, **options)
+
+
+def downgrade():
+    for name, table, columns, options in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,9 +1,18 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, update, inspect
+from sqlalchemy.dialects.postgresql import JSONB
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import os
 
 db = SQLAlchemy()
 
+# Hashing dominates login/signup latency; development and tests can opt into a cheaper
+# method such as 'pbkdf2:sha256:1000'. Existing hashes keep verifying whatever the setting.
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+# Never produced by generate_password_hash, so check_password_hash rejects every password against it
+UNUSABLE_PASSWORD_HASH = '!'
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -18,7 +27,10 @@ class User(db.Model):
     badges = db.relationship('UserBadge', back_populates='user', cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+    
+    def set_unusable_password(self):
+        self.password_hash = UNUSABLE_PASSWORD_HASH
     
     def check_password(self, password):
         if self.is_ghost:
@@ -41,7 +53,7 @@ class Group(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
-    contribution_amount = db.Column(db.Float, nullable=False)
+    contribution_amount = db.Column(db.Float, nullable=False, index=True)
     contribution_frequency = db.Column(db.String(20), nullable=False)
     group_code = db.Column(db.String(10), unique=True, nullable=False)
     currency = db.Column(db.String(3), default='USD')
@@ -50,6 +62,14 @@ class Group(db.Model):
     require_admin_approval = db.Column(db.Boolean, default=False)
     tradition_id = db.Column(db.Integer, db.ForeignKey('tradition.id'))
     cultural_theme = db.Column(db.String(50), default='default')
+    # Running totals maintained by the Transaction/Member flush events below
+    total_contributions = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+    total_payouts = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    @property
+    def balance(self):
+        return self.total_contributions - self.total_payouts
     
     members = db.relationship('Member', back_populates='group', cascade='all, delete-orphan')
     transactions = db.relationship('Transaction', back_populates='group', cascade='all, delete-orphan')
@@ -72,14 +92,24 @@ class Member(db.Model):
     group = db.relationship('Group', back_populates='members')
     transactions = db.relationship('Transaction', back_populates='member', cascade='all, delete-orphan')
     
-    __table_args__ = (db.UniqueConstraint('user_id', 'group_id', name='unique_user_group'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'group_id', name='unique_user_group'),
+        db.Index('ix_member_group_active', group_id, is_active),
+        db.Index('ix_member_user_active', user_id, is_active),
+        # Covers the admin guards, which only need the role for a (user, group) pair
+        db.Index('ix_member_user_group_role', user_id, group_id, role),
+        # admin_dashboard pulls pending requests for the admin's groups
+        db.Index('ix_member_group_status', group_id, approval_status),
+    )
 
 class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    group_id = db.Column(db.Integer, db.ForeignKey('group.id'), nullable=False)
+    # active_history keeps the old value on edits so the group totals can move it
+    group_id = db.mapped_column(db.Integer, db.ForeignKey('group.id'), nullable=False, active_history=True)
     member_id = db.Column(db.Integer, db.ForeignKey('member.id'), nullable=False)
-    transaction_type = db.Column(db.String(20), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
+    transaction_type = db.mapped_column(db.String(20), nullable=False, active_history=True)
+    # Exact to the cent; SUMs stay exact on PostgreSQL and rows come back as Decimal
+    amount = db.mapped_column(db.Numeric(12, 2), nullable=False, active_history=True)
     description = db.Column(db.Text)
     receipt_filename = db.Column(db.String(255))
     transaction_date = db.Column(db.DateTime, default=datetime.utcnow)
@@ -87,6 +117,71 @@ class Transaction(db.Model):
     
     group = db.relationship('Group', back_populates='transactions')
     member = db.relationship('Member', back_populates='transactions')
+    
+    __table_args__ = (
+        db.Index('ix_tx_member_type_date', member_id, transaction_type, transaction_date),
+        db.Index('ix_txn_group_type', group_id, transaction_type),
+        db.Index('ix_txn_group_date', group_id, transaction_date),
+    )
+
+GROUP_TOTAL_COLUMNS = {
+    'contribution': 'total_contributions',
+    'payout': 'total_payouts',
+}
+
+def adjust_group_column(connection, group_id, column_name, delta):
+    """Apply a delta to one of the group's running totals inside the current flush"""
+    column = getattr(Group, column_name)
+    connection.execute(
+        update(Group.__table__).where(Group.__table__.c.id == group_id).values({column_name: column + delta})
+    )
+
+@event.listens_for(Transaction, 'after_insert')
+def add_transaction_to_group_totals(mapper, connection, target):
+    column_name = GROUP_TOTAL_COLUMNS.get(target.transaction_type)
+    if column_name:
+        adjust_group_column(connection, target.group_id, column_name, target.amount)
+
+@event.listens_for(Transaction, 'after_delete')
+def remove_transaction_from_group_totals(mapper, connection, target):
+    column_name = GROUP_TOTAL_COLUMNS.get(target.transaction_type)
+    if column_name:
+        adjust_group_column(connection, target.group_id, column_name, -target.amount)
+
+@event.listens_for(Transaction, 'after_update')
+def move_transaction_between_group_totals(mapper, connection, target):
+    state = inspect(target)
+    previous = {}
+    for key in ('group_id', 'transaction_type', 'amount'):
+        history = state.attrs[key].history
+        if history.has_changes():
+            previous[key] = history.deleted[0] if history.deleted else None
+    if not previous:
+        return
+    old_column = GROUP_TOTAL_COLUMNS.get(previous.get('transaction_type', target.transaction_type))
+    old_group_id = previous.get('group_id', target.group_id)
+    old_amount = previous.get('amount', target.amount)
+    if old_column and old_amount is not None:
+        adjust_group_column(connection, old_group_id, old_column, -old_amount)
+    new_column = GROUP_TOTAL_COLUMNS.get(target.transaction_type)
+    if new_column:
+        adjust_group_column(connection, target.group_id, new_column, target.amount)
+
+@event.listens_for(Member, 'after_insert')
+def count_new_member(mapper, connection, target):
+    if target.is_active:
+        adjust_group_column(connection, target.group_id, 'member_count', 1)
+
+@event.listens_for(Member, 'after_update')
+def count_member_status_change(mapper, connection, target):
+    history = inspect(target).attrs.is_active.history
+    if history.has_changes():
+        adjust_group_column(connection, target.group_id, 'member_count', 1 if target.is_active else -1)
+
+@event.listens_for(Member, 'after_delete')
+def uncount_deleted_member(mapper, connection, target):
+    if target.is_active:
+        adjust_group_column(connection, target.group_id, 'member_count', -1)
 
 class Badge(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -190,11 +285,15 @@ class PersonalizedAdvice(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     advice_text = db.Column(db.Text, nullable=False)
     advice_type = db.Column(db.String(50))
-    context_data = db.Column(db.Text)
+    context_data = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     displayed = db.Column(db.Boolean, default=False)
     
     user = db.relationship('User', backref='personalized_advice')
+    
+    __table_args__ = (
+        db.Index('ix_personalized_advice_user_displayed_created', user_id, displayed, created_at.desc()),
+    )
 
 class UserFinancialProfile(db.Model):
     __tablename__ = 'user_financial_profile'
@@ -251,6 +350,13 @@ class PersonalTransaction(db.Model):
     
     user = db.relationship('User', backref='personal_transactions')
     plaid_account = db.relationship('PlaidAccount', backref='transactions')
+    
+    __table_args__ = (
+        # money_management lists and sums one user's recent window; on Postgres the INCLUDE
+        # columns let the income/expense sums be answered from the index alone
+        db.Index('ix_pt_user_date', user_id, transaction_date,
+                 postgresql_include=['amount', 'is_income']),
+    )
 
 class TellerAccount(db.Model):
     __tablename__ = 'teller_account'
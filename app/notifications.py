@@ -1,10 +1,23 @@
 import os
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 
 SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
 FROM_EMAIL = os.environ.get('FROM_EMAIL', 'noreply@tikob.app')
 
+# SendGrid accepts up to 1000 personalizations per request
+MAX_RECIPIENTS_PER_REQUEST = 1000
+
+# Group notifications go out in the background so the request returns immediately
+notification_sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notifications')
+
+@lru_cache(maxsize=1)
+def get_sendgrid_client():
+    """One API client per process, shared by every send instead of rebuilt per message"""
+    return SendGridAPIClient(SENDGRID_API_KEY)
+
 def send_email(to_email, subject, html_content):
     """Send email using SendGrid"""
     if not SENDGRID_API_KEY:
@@ -12,7 +25,7 @@ def send_email(to_email, subject, html_content):
         return False
     
     try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
+        sg = get_sendgrid_client()
         message = Mail(
             from_email=FROM_EMAIL,
             to_emails=to_email,
@@ -25,8 +38,56 @@ def send_email(to_email, subject, html_content):
         print(f"Error sending email: {e}")
         return False
 
+def send_bulk_email(to_emails, subject, html_content):
+    """Send one individually addressed copy per recipient in as few SendGrid requests as possible"""
+    if not SENDGRID_API_KEY:
+        print(f"WARNING: SENDGRID_API_KEY not set. Would send email to {len(to_emails)} recipients: {subject}")
+        return False
+    
+    try:
+        sg = get_sendgrid_client()
+        sent = True
+        for start in range(0, len(to_emails), MAX_RECIPIENTS_PER_REQUEST):
+            message = Mail(
+                from_email=FROM_EMAIL,
+                to_emails=to_emails[start:start + MAX_RECIPIENTS_PER_REQUEST],
+                subject=subject,
+                html_content=html_content,
+                is_multiple=True
+            )
+            response = sg.send(message)
+            sent = sent and response.status_code == 202
+        return sent
+    except Exception as e:
+        print(f"Error sending email: {e}")
+        return False
+
+def notify_group_transaction(recipient_emails, transaction_type, group_name, amount, member_name):
+    """Queue one batched contribution or payout email for all group members"""
+    if not recipient_emails:
+        return None
+    if transaction_type == 'contribution':
+        subject, html_content = contribution_email(group_name, amount, member_name)
+    else:
+        subject, html_content = payout_email(group_name, amount, member_name)
+    return notification_sender.submit(send_bulk_email, list(recipient_emails), subject, html_content)
+
+def notify_badges_earned(user_email, badges):
+    """Queue one achievement email per (name, description) pair without blocking the request"""
+    if not badges:
+        return None
+    return notification_sender.submit(send_badge_notifications, user_email, list(badges))
+
+def send_badge_notifications(user_email, badges):
+    for badge_name, badge_description in badges:
+        send_badge_notification(user_email, badge_name, badge_description)
+
 def send_contribution_notification(user_email, group_name, amount, contributor_name):
     """Notify group members of a new contribution"""
+    subject, html_content = contribution_email(group_name, amount, contributor_name)
+    return send_email(user_email, subject, html_content)
+
+def contribution_email(group_name, amount, contributor_name):
     subject = f"New Contribution in {group_name}"
     html_content = f"""
     <html>
@@ -41,7 +102,7 @@ def send_contribution_notification(user_email, group_name, amount, contributor_n
         </body>
     </html>
     """
-    return send_email(user_email, subject, html_content)
+    return subject, html_content
 
 def send_approval_notification(user_email, group_name, approved=True):
     """Notify user of approval/rejection"""
@@ -86,6 +147,10 @@ def send_badge_notification(user_email, badge_name, badge_description):
 
 def send_payout_notification(user_email, group_name, amount, recipient_name):
     """Notify group members of a payout"""
+    subject, html_content = payout_email(group_name, amount, recipient_name)
+    return send_email(user_email, subject, html_content)
+
+def payout_email(group_name, amount, recipient_name):
     subject = f"Payout from {group_name}"
     html_content = f"""
     <html>
@@ -100,4 +165,4 @@ def send_payout_notification(user_email, group_name, amount, recipient_name):
         </body>
     </html>
     """
-    return send_email(user_email, subject, html_content)
+    return subject, html_content
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from models import Tradition, db
 
 CULTURAL_TRADITIONS = [
@@ -86,67 +87,75 @@ CULTURAL_TRADITIONS = [
 
 def seed_traditions():
     """Seed the database with predefined cultural savings traditions"""
+    existing_names = set(db.session.scalars(db.select(Tradition.name)))
     for tradition_data in CULTURAL_TRADITIONS:
-        existing = Tradition.query.filter_by(name=tradition_data['name']).first()
-        if not existing:
+        if tradition_data['name'] not in existing_names:
             tradition = Tradition(**tradition_data)
             db.session.add(tradition)
     
     db.session.commit()
+    get_all_traditions.cache_clear()
     print(f"✅ Seeded {len(CULTURAL_TRADITIONS)} cultural savings traditions")
 
+@lru_cache(maxsize=1)
+def get_all_traditions():
+    """Tradition reference data as detached rows; cleared whenever traditions are seeded"""
+    return tuple(db.session.execute(db.select(Tradition.__table__).order_by(Tradition.id)).all())
+
+# Built once at import; callers only read the color mappings
+TRADITION_THEMES = {
+    'haitian': {
+        'primary': '#003087',
+        'secondary': '#D21034',
+        'accent': '#F5A623'
+    },
+    'mexican': {
+        'primary': '#006847',
+        'secondary': '#CE1126',
+        'accent': '#FFD700'
+    },
+    'kenyan': {
+        'primary': '#BB0000',
+        'secondary': '#006600',
+        'accent': '#FFFFFF'
+    },
+    'caribbean': {
+        'primary': '#FFB81C',
+        'secondary': '#009B3A',
+        'accent': '#000000'
+    },
+    'nigerian': {
+        'primary': '#008751',
+        'secondary': '#FFFFFF',
+        'accent': '#FFD700'
+    },
+    'south_african': {
+        'primary': '#007A3D',
+        'secondary': '#FFB81C',
+        'accent': '#DE3831'
+    },
+    'chinese': {
+        'primary': '#DE2910',
+        'secondary': '#FFDE00',
+        'accent': '#C0C0C0'
+    },
+    'indonesian': {
+        'primary': '#FF0000',
+        'secondary': '#FFFFFF',
+        'accent': '#FFD700'
+    },
+    'global': {
+        'primary': '#1B2A49',
+        'secondary': '#D4AF37',
+        'accent': '#F5F5DC'
+    },
+    'default': {
+        'primary': '#1B2A49',
+        'secondary': '#D4AF37',
+        'accent': '#F5F5DC'
+    }
+}
+
 def get_tradition_theme_colors(theme):
     """Return theme-specific color schemes for UI personalization"""
-    themes = {
-        'haitian': {
-            'primary': '#003087',
-            'secondary': '#D21034',
-            'accent': '#F5A623'
-        },
-        'mexican': {
-            'primary': '#006847',
-            'secondary': '#CE1126',
-            'accent': '#FFD700'
-        },
-        'kenyan': {
-            'primary': '#BB0000',
-            'secondary': '#006600',
-            'accent': '#FFFFFF'
-        },
-        'caribbean': {
-            'primary': '#FFB81C',
-            'secondary': '#009B3A',
-            'accent': '#000000'
-        },
-        'nigerian': {
-            'primary': '#008751',
-            'secondary': '#FFFFFF',
-            'accent': '#FFD700'
-        },
-        'south_african': {
-            'primary': '#007A3D',
-            'secondary': '#FFB81C',
-            'accent': '#DE3831'
-        },
-        'chinese': {
-            'primary': '#DE2910',
-            'secondary': '#FFDE00',
-            'accent': '#C0C0C0'
-        },
-        'indonesian': {
-            'primary': '#FF0000',
-            'secondary': '#FFFFFF',
-            'accent': '#FFD700'
-        },
-        'global': {
-            'primary': '#1B2A49',
-            'secondary': '#D4AF37',
-            'accent': '#F5F5DC'
-        },
-        'default': {
-            'primary': '#1B2A49',
-            'secondary': '#D4AF37',
-            'accent': '#F5F5DC'
-        }
-    }
-    return themes.get(theme, themes['default'])
+    return TRADITION_THEMES.get(theme, TRADITION_THEMES['default'])
@@ -4,6 +4,7 @@ import os
 from datetime import datetime, timedelta
 from models import db, Badge, UserBadge, FinancialTip, Transaction, Member
 import random
+from functools import lru_cache
 
 CURRENCY_RATES = {
     'USD': 1.0,
@@ -88,10 +89,20 @@ def calculate_reputation_score_for_badges(user_id):
     
     return int(consistency_score + activity_score)
 
+@lru_cache(maxsize=1)
+def get_all_badges():
+    """Badge definitions as detached rows; they only change when seeded, which clears this cache"""
+    return tuple(db.session.execute(db.select(Badge.__table__).order_by(Badge.id)).all())
+
+@lru_cache(maxsize=1)
+def get_all_financial_tips():
+    """Financial tips as detached rows; they only change when seeded, which clears this cache"""
+    return tuple(db.session.execute(db.select(FinancialTip.__table__).order_by(FinancialTip.id)).all())
+
 def check_and_award_badges(user_id):
     """Check and award all types of badges to a user."""
     user_badges = UserBadge.query.filter_by(user_id=user_id).all()
-    awarded_badge_ids = [ub.badge_id for ub in user_badges]
+    awarded_badge_ids = {ub.badge_id for ub in user_badges}
     
     total_contributions = db.session.query(db.func.sum(Transaction.amount)).join(
         Member
@@ -108,7 +119,7 @@ def check_and_award_badges(user_id):
     reputation_score = calculate_reputation_score_for_badges(user_id)
     
     badges_to_award = []
-    all_badges = Badge.query.all()
+    all_badges = get_all_badges()
     
     for badge in all_badges:
         if badge.id in awarded_badge_ids:
@@ -138,20 +149,28 @@ def check_and_award_badges(user_id):
         db.session.add(user_badge)
     
     if badges_to_award:
-        db.session.commit()
+        db.session.flush()
     
     return badges_to_award
 
-def generate_group_report_csv(group_id):
-    from models import Group, Member, Transaction
-    
-    group = Group.query.get_or_404(group_id)
-    members = Member.query.filter_by(group_id=group_id, is_active=True).all()
-    transactions = Transaction.query.filter_by(group_id=group_id).order_by(Transaction.transaction_date.desc()).all()
+REPORT_BATCH_SIZE = 500
+
+def iter_group_report_csv(group):
+    """Yield the group report CSV in chunks so large ledgers never sit in memory at once"""
+    from models import Member, Transaction, User
+    from sqlalchemy.orm import selectinload
     
     output = io.StringIO()
     writer = csv.writer(output)
     
+    def flush():
+        chunk = output.getvalue()
+        output.seek(0)
+        output.truncate()
+        return chunk
+    
+    members = Member.query.options(selectinload(Member.user)).filter_by(group_id=group.id, is_active=True).all()
+    
     writer.writerow(['TiKòb Financial Report'])
     writer.writerow(['Group:', group.name])
     writer.writerow(['Generated:', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')])
@@ -163,59 +182,85 @@ def generate_group_report_csv(group_id):
     writer.writerow(['Frequency', group.contribution_frequency])
     writer.writerow([])
     
-    total_contributions = sum(t.amount for t in transactions if t.transaction_type == 'contribution')
-    total_payouts = sum(t.amount for t in transactions if t.transaction_type == 'payout')
-    
-    writer.writerow(['Total Contributions', f'{group.currency} {total_contributions:.2f}'])
-    writer.writerow(['Total Payouts', f'{group.currency} {total_payouts:.2f}'])
-    writer.writerow(['Current Balance', f'{group.currency} {(total_contributions - total_payouts):.2f}'])
+    writer.writerow(['Total Contributions', f'{group.currency} {group.total_contributions:.2f}'])
+    writer.writerow(['Total Payouts', f'{group.currency} {group.total_payouts:.2f}'])
+    writer.writerow(['Current Balance', f'{group.currency} {group.balance:.2f}'])
     writer.writerow([])
     
+    member_totals = {
+        row.member_id: row for row in db.session.query(
+            Transaction.member_id,
+            db.func.coalesce(db.func.sum(db.case((Transaction.transaction_type == 'contribution', Transaction.amount))), 0).label('contributed'),
+            db.func.coalesce(db.func.sum(db.case((Transaction.transaction_type == 'payout', Transaction.amount))), 0).label('received')
+        ).filter(Transaction.group_id == group.id).group_by(Transaction.member_id)
+    }
+    
     writer.writerow(['MEMBER DETAILS'])
     writer.writerow(['Username', 'Role', 'Joined', 'Total Contributed', 'Total Received'])
     
     for member in members:
-        member_contributions = sum(t.amount for t in member.transactions if t.transaction_type == 'contribution')
-        member_payouts = sum(t.amount for t in member.transactions if t.transaction_type == 'payout')
-        
+        totals = member_totals.get(member.id)
         writer.writerow([
             member.user.username,
             member.role,
             member.joined_at.strftime('%Y-%m-%d'),
-            f'{group.currency} {member_contributions:.2f}',
-            f'{group.currency} {member_payouts:.2f}'
+            f'{group.currency} {totals.contributed if totals else 0:.2f}',
+            f'{group.currency} {totals.received if totals else 0:.2f}'
         ])
     
     writer.writerow([])
     writer.writerow(['TRANSACTION HISTORY'])
     writer.writerow(['Date', 'Member', 'Type', 'Amount', 'Description', 'Verified'])
-    
-    for transaction in transactions:
-        writer.writerow([
-            transaction.transaction_date.strftime('%Y-%m-%d %H:%M:%S'),
-            transaction.member.user.username,
-            transaction.transaction_type,
-            f'{group.currency} {transaction.amount:.2f}',
-            transaction.description or '',
-            'Yes' if transaction.verified else 'No'
-        ])
-    
-    output.seek(0)
-    return output.getvalue()
+    yield flush()
+    
+    # Plain column rows fetched in batches; no ORM objects are built for the history
+    history = db.session.execute(
+        db.select(
+            Transaction.transaction_date,
+            User.username,
+            Transaction.transaction_type,
+            Transaction.amount,
+            Transaction.description,
+            Transaction.verified
+        ).join(Member, Transaction.member_id == Member.id).join(User, Member.user_id == User.id)
+        .where(Transaction.group_id == group.id)
+        .order_by(Transaction.transaction_date.desc())
+        .execution_options(yield_per=REPORT_BATCH_SIZE)
+    )
+    
+    for batch in history.partitions():
+        for transaction in batch:
+            writer.writerow([
+                transaction.transaction_date.strftime('%Y-%m-%d %H:%M:%S'),
+                transaction.username,
+                transaction.transaction_type,
+                f'{group.currency} {transaction.amount:.2f}',
+                transaction.description or '',
+                'Yes' if transaction.verified else 'No'
+            ])
+        yield flush()
 
 def get_financial_advice(user_id):
     from models import Member, Transaction
     
-    tips = FinancialTip.query.order_by(db.func.random()).limit(3).all()
+    # Pick from the cached tip list instead of sorting the table by random() per request
+    all_tips = get_all_financial_tips()
+    tips = random.sample(all_tips, min(3, len(all_tips)))
     
-    total_saved = db.session.query(db.func.sum(Transaction.amount)).join(
+    # Both figures come back in one round-trip as scalar subqueries
+    saved_subquery = db.select(db.func.coalesce(db.func.sum(Transaction.amount), 0)).join(
         Member
-    ).filter(
+    ).where(
         Member.user_id == user_id,
         Transaction.transaction_type == 'contribution'
-    ).scalar() or 0
+    ).scalar_subquery()
+    
+    groups_subquery = db.select(db.func.count(Member.id)).where(
+        Member.user_id == user_id,
+        Member.is_active == True
+    ).scalar_subquery()
     
-    groups_count = Member.query.filter_by(user_id=user_id, is_active=True).count()
+    total_saved, groups_count = db.session.execute(db.select(saved_subquery, groups_subquery)).one()
     
     advice = {
         'tips': tips,
@@ -278,6 +323,8 @@ def seed_initial_data():
         db.session.add_all(tips)
     
     db.session.commit()
+    get_all_badges.cache_clear()
+    get_all_financial_tips.cache_clear()
 
 def cleanup_old_receipts(upload_folder, retention_days=90):
     if not os.path.exists(upload_folder):
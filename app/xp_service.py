@@ -2,6 +2,8 @@ from models import db, UserXP, Transaction, UserChallenge, Challenge
 from datetime import datetime, timedelta
 from notifications import send_badge_notification
 
+# These helpers flush rather than commit; the calling route commits once for the whole request
+
 XP_PER_CONTRIBUTION = 10
 XP_PER_LEVEL = 100
 
@@ -19,7 +21,7 @@ def award_xp(user_id, xp_amount, reason="contribution"):
     leveled_up = new_level > user_xp.current_level
     user_xp.current_level = new_level
     
-    db.session.commit()
+    db.session.flush()
     
     return {
         'xp_awarded': xp_amount,
@@ -37,7 +39,7 @@ def update_streak(user_id):
         user_xp = UserXP(user_id=user_id, total_xp=0, current_level=1, current_streak=1)
         user_xp.last_contribution_date = datetime.utcnow()
         db.session.add(user_xp)
-        db.session.commit()
+        db.session.flush()
         return 1
     
     now = datetime.utcnow()
@@ -61,7 +63,7 @@ def update_streak(user_id):
     streak_bonus_xp = min(user_xp.current_streak * 2, 50)
     user_xp.total_xp += streak_bonus_xp
     
-    db.session.commit()
+    db.session.flush()
     
     return user_xp.current_streak
 
@@ -110,6 +112,6 @@ def check_challenge_progress(user_id):
                 award_xp(user_id, challenge.xp_reward, "challenge_completion")
                 completed_challenges.append(challenge)
     
-    db.session.commit()
+    db.session.flush()
     
     return completed_challenges
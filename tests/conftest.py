@@ -3,9 +3,13 @@ import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
 
-from app import app as flask_app, db
-from models import User, Group, Member, Badge, FinancialTip
+from app import app as flask_app, db, cashflow_cache
+from models import User, Group, Member, Transaction, Badge, FinancialTip
+from advice_service import advice_cache
+from utils import get_all_badges, get_all_financial_tips
+from traditions_data import get_all_traditions
 
 @pytest.fixture(scope='function')
 def app():
@@ -13,6 +17,13 @@ def app():
     flask_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     flask_app.config['WTF_CSRF_ENABLED'] = False
     flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    flask_app.config['RAISE_ON_LAZY_LOAD'] = True
+    
+    advice_cache.clear()
+    cashflow_cache.clear()
+    get_all_badges.cache_clear()
+    get_all_financial_tips.cache_clear()
+    get_all_traditions.cache_clear()
     
     with flask_app.app_context():
         db.create_all()
@@ -72,3 +83,59 @@ def test_group(app, test_admin_user):
     db.session.commit()
     
     return group
+
+@pytest.fixture
+def login(client):
+    """Sign the test client in as a user; extra keyword arguments go into the session too"""
+    def login_as(user, **session_values):
+        with client.session_transaction() as sess:
+            sess['user_id'] = user.id
+            sess['username'] = user.username
+            sess.update(session_values)
+    return login_as
+
+@pytest.fixture
+def add_group(app):
+    """Create a group with its creator as admin"""
+    def create(creator, name, group_code, contribution_amount=10.00, **fields):
+        fields.setdefault('contribution_frequency', 'monthly')
+        group = Group(
+            name=name,
+            group_code=group_code,
+            contribution_amount=contribution_amount,
+            created_by=creator.id,
+            **fields
+        )
+        group.members.append(Member(user_id=creator.id, role='admin'))
+        db.session.add(group)
+        db.session.commit()
+        return group
+    return create
+
+@pytest.fixture
+def add_member(app):
+    """Add an approved, active member to a group"""
+    def create(user, group, **fields):
+        fields.setdefault('role', 'member')
+        fields.setdefault('approval_status', 'approved')
+        fields.setdefault('is_active', True)
+        member = Member(user_id=user.id, group_id=group.id, **fields)
+        db.session.add(member)
+        db.session.commit()
+        return member
+    return create
+
+@pytest.fixture
+def record_transaction(app):
+    """Add a group transaction to the session; the test commits"""
+    def record(group, member, transaction_type, amount, **fields):
+        transaction = Transaction(
+            group_id=group.id,
+            member_id=member.id,
+            transaction_type=transaction_type,
+            amount=amount,
+            **fields
+        )
+        db.session.add(transaction)
+        return transaction
+    return record
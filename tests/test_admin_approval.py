@@ -103,3 +103,31 @@ def test_admin_dashboard_shows_pending(client, app, test_group, test_user, test_
     assert response.status_code == 200
     assert b'testuser' in response.data
     assert b'Pending Approvals' in response.data
+
+def test_admin_dashboard_lists_pending_across_groups(client, app, login, add_group, add_member, test_group, test_user, test_admin_user):
+    second_group = add_group(test_admin_user, 'Second Group', 'SECOND1', 20.00)
+    
+    for group in (test_group, second_group):
+        add_member(test_user, group, approval_status='pending', is_active=False)
+    
+    login(test_admin_user)
+    
+    response = client.get('/admin-dashboard')
+    
+    assert response.status_code == 200
+    assert response.data.count(b'test@example.com') == 2
+    assert b'Code: SECOND1' in response.data
+    assert b'1 active' in response.data
+
+def test_admin_cannot_approve_member_of_another_group(client, app, login, add_group, add_member, test_group, test_user, test_admin_user):
+    # The admin's own pending request to join a group someone else runs
+    other_group = add_group(test_user, 'Other Group', 'OTHER123', 20.00)
+    outsider = add_member(test_admin_user, other_group, approval_status='pending', is_active=False)
+
+    login(test_admin_user)
+
+    response = client.post(f'/group/{test_group.id}/approve-member/{outsider.id}')
+
+    assert response.status_code == 404
+    db.session.refresh(outsider)
+    assert outsider.approval_status == 'pending'
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta
+from models import PersonalizedAdvice, UserXP, FinancialGoal, db
+from advice_service import generate_personalized_advice, get_latest_advice, advice_writer, advice_cache
+
+def test_advice_without_contributions(app, test_user):
+    with app.app_context():
+        advice = generate_personalized_advice(test_user.id)
+
+        assert 'Start your savings journey' in advice
+
+        advice_writer.submit(lambda: None).result()
+        assert PersonalizedAdvice.query.filter_by(user_id=test_user.id).count() == 0
+
+def test_advice_counts_recent_contributions(app, add_member, record_transaction, test_user, test_group):
+    with app.app_context():
+        member = add_member(test_user, test_group)
+
+        for _ in range(4):
+            record_transaction(test_group, member, 'contribution', 25.00)
+        record_transaction(test_group, member, 'contribution', 500.00, transaction_date=datetime.utcnow() - timedelta(days=60))
+        db.session.commit()
+
+        advice = generate_personalized_advice(test_user.id)
+
+        assert '4 contributions this month' in advice
+
+        advice_writer.submit(lambda: None).result()
+        stored = PersonalizedAdvice.query.filter_by(user_id=test_user.id).first()
+        assert stored.context_data == {'total_saved': 600.0, 'recent_count': 4}
+
+def test_advice_flags_lapsed_saver(app, add_member, record_transaction, test_user, test_group):
+    with app.app_context():
+        member = add_member(test_user, test_group)
+
+        record_transaction(test_group, member, 'contribution', 75.00, transaction_date=datetime.utcnow() - timedelta(days=45))
+        db.session.commit()
+
+        advice = generate_personalized_advice(test_user.id)
+
+        assert "haven't seen you contribute in 30 days" in advice
+
+def test_advice_uses_goals_and_streak(app, add_member, record_transaction, test_user, test_group):
+    with app.app_context():
+        member = add_member(test_user, test_group)
+        record_transaction(test_group, member, 'contribution', 20.00)
+        db.session.add(UserXP(user_id=test_user.id, current_streak=8))
+        db.session.add(FinancialGoal(
+            user_id=test_user.id,
+            goal_name='Emergency Fund',
+            target_amount=1000.00,
+            current_amount=800.00
+        ))
+        db.session.add(FinancialGoal(
+            user_id=test_user.id,
+            goal_name='Vacation',
+            target_amount=0,
+            current_amount=0
+        ))
+        db.session.add(FinancialGoal(
+            user_id=test_user.id,
+            goal_name='New Car',
+            target_amount=1000.00,
+            current_amount=1000.00,
+            achieved=True
+        ))
+        db.session.commit()
+
+        advice = generate_personalized_advice(test_user.id)
+
+        assert "80% toward your 'Emergency Fund' goal" in advice
+
+        db.session.query(FinancialGoal).delete()
+        db.session.commit()
+        advice_cache.clear()
+
+        advice = generate_personalized_advice(test_user.id)
+
+        assert 'Amazing 8-day streak' in advice
+
+def test_latest_advice_is_marked_displayed(app, test_user):
+    with app.app_context():
+        db.session.add(PersonalizedAdvice(
+            user_id=test_user.id,
+            advice_text='Older advice',
+            created_at=datetime.utcnow() - timedelta(days=1)
+        ))
+        db.session.add(PersonalizedAdvice(
+            user_id=test_user.id,
+            advice_text='Newest advice'
+        ))
+        db.session.commit()
+
+        assert get_latest_advice(test_user.id) == 'Newest advice'
+        assert get_latest_advice(test_user.id) == 'Older advice'
+
+        displayed = PersonalizedAdvice.query.filter_by(user_id=test_user.id, displayed=True).count()
+        assert displayed == 2
+
+def test_advice_is_cached_per_user(app, add_member, record_transaction, test_user, test_group):
+    with app.app_context():
+        first = generate_personalized_advice(test_user.id)
+
+        member = add_member(test_user, test_group)
+        record_transaction(test_group, member, 'contribution', 2000.00)
+        db.session.commit()
+
+        assert generate_personalized_advice(test_user.id) == first
+
+        advice_cache.clear()
+        assert generate_personalized_advice(test_user.id) != first
@@ -0,0 +1,57 @@
+import pytest
+from models import User
+
+def test_signup_rejects_taken_username(client, app, test_user):
+    response = client.post('/signup', data={
+        'username': 'testuser',
+        'email': 'other@example.com',
+        'password': 'password123'
+    }, follow_redirects=True)
+
+    assert b'Username already exists.' in response.data
+    assert User.query.count() == 1
+
+def test_signup_rejects_taken_email(client, app, test_user):
+    response = client.post('/signup', data={
+        'username': 'someoneelse',
+        'email': 'test@example.com',
+        'password': 'password123'
+    }, follow_redirects=True)
+
+    assert b'Email already exists.' in response.data
+    assert User.query.count() == 1
+
+def test_signup_creates_user(client, app):
+    response = client.post('/signup', data={
+        'username': 'newuser',
+        'email': 'new@example.com',
+        'password': 'password123'
+    }, follow_redirects=True)
+
+    assert b'Account created successfully!' in response.data
+    assert User.query.filter_by(username='newuser').one().check_password('password123')
+
+def test_logout_keeps_language_preference(client, app, login, test_user):
+    login(test_user, language='ht')
+
+    client.get('/logout')
+
+    with client.session_transaction() as sess:
+        assert 'user_id' not in sess
+        assert 'username' not in sess
+        assert sess['language'] == 'ht'
+
+def test_set_language_same_value_skips_session_write(client, app):
+    with client.session_transaction() as sess:
+        sess['language'] = 'ht'
+
+    response = client.get('/set-language/ht')
+
+    assert response.status_code == 302
+    assert 'Set-Cookie' not in response.headers
+
+    response = client.get('/set-language/es')
+
+    assert 'Set-Cookie' in response.headers
+    with client.session_transaction() as sess:
+        assert sess['language'] == 'es'
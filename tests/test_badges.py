@@ -89,3 +89,38 @@ def test_badge_not_awarded_twice(app, test_user, test_group):
         
         awarded2 = check_and_award_badges(test_user.id)
         assert len(awarded2) == 0
+
+def test_my_badges_splits_earned_and_locked(client, app, login, test_user):
+    earned = Badge(name='Early Bird', description='Joined early', icon='🐦',
+                   criteria_type='group_count', criteria_value=1)
+    locked = Badge(name='Elite Contributor', description='Top saver', icon='👑',
+                   criteria_type='total_contributions', criteria_value=5000)
+    db.session.add_all([earned, locked])
+    db.session.commit()
+    db.session.add(UserBadge(user_id=test_user.id, badge_id=earned.id))
+    db.session.commit()
+
+    login(test_user)
+
+    response = client.get('/my-badges')
+
+    assert response.status_code == 200
+    page = response.data.decode()
+    locked_section = page.split('Available Badges')[1]
+    assert 'Early Bird' in page.split('Available Badges')[0]
+    assert 'Early Bird' not in locked_section
+    assert 'Elite Contributor' in locked_section
+
+def test_financial_advice_samples_cached_tips(app, test_user):
+    from models import FinancialTip
+    from utils import get_financial_advice
+    with app.app_context():
+        for i in range(5):
+            db.session.add(FinancialTip(title=f'Tip {i}', content='Save a little every week.'))
+        db.session.commit()
+
+        advice = get_financial_advice(test_user.id)
+
+        assert len(advice['tips']) == 3
+        assert len({tip.id for tip in advice['tips']}) == 3
+        assert advice['total_saved'] == 0
@@ -0,0 +1,55 @@
+import pytest
+from models import Member, db
+
+def test_dashboard_without_groups(client, app, login, test_user):
+    login(test_user)
+
+    response = client.get('/dashboard')
+
+    assert response.status_code == 200
+
+def test_dashboard_shows_group_balance(client, app, record_transaction, login, test_group, test_admin_user):
+    admin_member = Member.query.filter_by(
+        user_id=test_admin_user.id,
+        group_id=test_group.id
+    ).first()
+    record_transaction(test_group, admin_member, 'contribution', 120.00)
+    record_transaction(test_group, admin_member, 'payout', 20.00)
+    db.session.commit()
+
+    login(test_admin_user)
+
+    response = client.get('/dashboard')
+
+    assert response.status_code == 200
+    assert b'Test Group' in response.data
+    assert b'$100.00' in response.data
+    assert b'1 members' in response.data
+
+def test_dashboard_redirects_unknown_session_user(client, app):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 9999
+
+    response = client.get('/dashboard')
+
+    assert response.status_code == 302
+    assert '/login' in response.headers['Location']
+
+def test_random_proverb_api(client, app, login, test_user):
+    login(test_user, language='ht')
+
+    response = client.get('/api/random-proverb')
+
+    proverb = response.get_json()['proverb']
+    assert set(proverb) == {'text', 'translation', 'meaning'}
+
+def test_fallback_proverb_is_a_private_dict(app):
+    import json
+    from ai_service import get_fallback_proverb, FALLBACK_PROVERBS
+
+    proverb = get_fallback_proverb()
+    proverb['creole'] = 'changed'
+
+    assert type(proverb) is dict
+    assert json.loads(json.dumps(proverb))['creole'] == 'changed'
+    assert all(entry['creole'] != 'changed' for entry in FALLBACK_PROVERBS)
@@ -1,7 +1,8 @@
 import pytest
 import io
+import hashlib
 from werkzeug.datastructures import FileStorage
-from models import Member
+from models import Member, Transaction
 
 def test_transaction_with_receipt_upload(client, app, test_group, test_admin_user):
     with app.app_context():
@@ -30,6 +31,8 @@ def test_transaction_with_receipt_upload(client, app, test_group, test_admin_use
     )
     
     assert response.status_code == 200
+    receipt_filename = Transaction.query.one().receipt_filename
+    assert receipt_filename == hashlib.sha256(b'fake image content').hexdigest() + '.jpg'
 
 def test_invalid_file_type_rejected(client, app, test_group, test_admin_user):
     with app.app_context():
@@ -83,3 +86,40 @@ def test_transaction_without_receipt(client, app, test_group, test_admin_user):
     
     assert response.status_code == 200
     assert b'Transaction recorded' in response.data
+
+def test_receipt_download_handed_to_nginx(client, app, login, test_user, monkeypatch):
+    monkeypatch.setitem(app.config, 'RECEIPTS_ACCEL_PREFIX', '/protected_receipts/')
+    login(test_user)
+
+    response = client.get('/uploads/receipts/abc_receipt.pdf')
+
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == '/protected_receipts/abc_receipt.pdf'
+    assert response.mimetype == 'application/pdf'
+    assert response.data == b''
+
+def test_identical_receipts_share_one_file(client, app, login, test_group, test_admin_user):
+    admin_member = Member.query.filter_by(user_id=test_admin_user.id, group_id=test_group.id).first()
+    login(test_admin_user)
+
+    for name in ('march.PDF', 'march-copy.pdf'):
+        client.post(f'/group/{test_group.id}/add-transaction', data={
+            'transaction_type': 'contribution',
+            'amount': '10.00',
+            'member_id': admin_member.id,
+            'receipt': (io.BytesIO(b'%PDF-1.4 same receipt'), name)
+        }, content_type='multipart/form-data')
+
+    filenames = {t.receipt_filename for t in Transaction.query.all()}
+    assert filenames == {hashlib.sha256(b'%PDF-1.4 same receipt').hexdigest() + '.pdf'}
+
+def test_receipt_download_uses_x_sendfile(client, app, login, test_user, monkeypatch, tmp_path):
+    (tmp_path / 'abc.pdf').write_bytes(b'%PDF-1.4')
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setitem(app.config, 'USE_X_SENDFILE', True)
+    login(test_user)
+
+    response = client.get('/uploads/receipts/abc.pdf')
+
+    assert response.headers['X-Sendfile'] == str(tmp_path / 'abc.pdf')
+    assert response.data == b''
@@ -0,0 +1,74 @@
+import pytest
+from decimal import Decimal
+from models import Group, Member, Transaction, db
+
+def test_transactions_update_group_totals(app, record_transaction, test_group, test_admin_user):
+    admin_member = Member.query.filter_by(user_id=test_admin_user.id).first()
+    contribution = record_transaction(test_group, admin_member, 'contribution', 80.00)
+    record_transaction(test_group, admin_member, 'payout', 30.00)
+    db.session.commit()
+
+    group = db.session.get(Group, test_group.id)
+    assert group.total_contributions == 80.00
+    assert group.total_payouts == 30.00
+    assert group.balance == 50.00
+
+    db.session.delete(contribution)
+    db.session.commit()
+
+    assert group.total_contributions == 0
+    assert group.balance == -30.00
+
+def test_editing_a_transaction_moves_its_totals(app, add_group, record_transaction, test_group, test_admin_user, test_user):
+    admin_member = Member.query.filter_by(user_id=test_admin_user.id).first()
+    other_group = add_group(test_user, 'Other', 'OTHER1')
+    transaction = record_transaction(test_group, admin_member, 'contribution', Decimal('50.00'))
+    db.session.commit()
+
+    transaction.amount = Decimal('65.00')
+    db.session.commit()
+    assert test_group.total_contributions == Decimal('65.00')
+
+    transaction.transaction_type = 'payout'
+    db.session.commit()
+    assert test_group.total_contributions == 0
+    assert test_group.total_payouts == Decimal('65.00')
+
+    transaction.group_id = other_group.id
+    transaction.amount = Decimal('20.00')
+    db.session.commit()
+    assert test_group.total_payouts == 0
+    assert other_group.total_payouts == Decimal('20.00')
+
+    transaction.description = 'Typo fixed'
+    db.session.commit()
+    assert other_group.total_payouts == Decimal('20.00')
+
+def test_member_count_follows_active_members(app, add_member, test_group, test_user):
+    assert test_group.member_count == 1
+
+    member = add_member(test_user, test_group, is_active=False)
+    assert test_group.member_count == 1
+
+    member.is_active = True
+    db.session.commit()
+    assert test_group.member_count == 2
+
+    db.session.delete(member)
+    db.session.commit()
+    assert test_group.member_count == 1
+
+def test_totals_are_exact_to_the_cent(client, app, login, test_group, test_admin_user):
+    admin_member = Member.query.filter_by(user_id=test_admin_user.id).first()
+    login(test_admin_user)
+
+    for amount in ('0.10', '0.20'):
+        client.post(f'/group/{test_group.id}/add-transaction', data={
+            'transaction_type': 'contribution',
+            'amount': amount,
+            'member_id': admin_member.id
+        })
+
+    group = db.session.get(Group, test_group.id)
+    assert group.total_contributions == Decimal('0.30')
+    assert sum(t.amount for t in Transaction.query.all()) == Decimal('0.30')
@@ -0,0 +1,308 @@
+import re
+import pytest
+from decimal import Decimal
+from models import Group, Member, Transaction, db
+
+@pytest.fixture
+def group_with_activity(app, test_group, test_user, test_admin_user, add_member, record_transaction):
+    admin_member = Member.query.filter_by(
+        user_id=test_admin_user.id,
+        group_id=test_group.id
+    ).first()
+    member = add_member(test_user, test_group)
+
+    record_transaction(test_group, admin_member, 'contribution', 40.00)
+    record_transaction(test_group, member, 'contribution', 75.50)
+    record_transaction(test_group, member, 'payout', 30.00)
+    db.session.commit()
+
+    return test_group
+
+def test_group_detail_member_totals(client, login, group_with_activity, test_admin_user):
+    login(test_admin_user)
+
+    response = client.get(f'/group/{group_with_activity.id}')
+
+    assert response.status_code == 200
+    assert b'testuser' in response.data
+    assert b'$75.50' in response.data
+    assert b'$30.00' in response.data
+    assert b'$40.00' in response.data
+
+def test_group_detail_requires_membership(client, app, login, test_group, test_user):
+    login(test_user)
+
+    response = client.get(f'/group/{test_group.id}', follow_redirects=True)
+
+    assert b'You are not a member of this group.' in response.data
+
+def test_ledger_totals(client, login, group_with_activity, test_admin_user):
+    login(test_admin_user)
+
+    response = client.get(f'/group/{group_with_activity.id}/ledger')
+
+    assert response.status_code == 200
+    assert b'$115.50' in response.data
+    assert b'$30.00' in response.data
+    assert b'$85.50' in response.data
+
+def test_create_group_adds_creator_as_admin(client, app, login, test_user):
+    login(test_user)
+
+    response = client.post('/create-group', data={
+        'name': 'Family Circle',
+        'description': 'Monthly family savings',
+        'contribution_amount': '25',
+        'contribution_frequency': 'monthly'
+    }, follow_redirects=True)
+
+    assert response.status_code == 200
+    assert b'created successfully' in response.data
+
+    # The follow-up group_detail render shares this session and leaves raiseload on the Member
+    membership = Member.query.filter_by(user_id=test_user.id).one()
+    group = db.session.get(Group, membership.group_id)
+    assert membership.role == 'admin'
+    assert group.name == 'Family Circle'
+    assert re.fullmatch(r'[0-9A-F]{8}', group.group_code)
+
+def test_create_group_retries_colliding_code(client, app, login, test_group, test_user, monkeypatch):
+    import app as app_module
+    codes = iter(['TEST123', 'ABCD1234'])
+    monkeypatch.setattr(app_module, 'generate_group_code', lambda: next(codes))
+    login(test_user)
+
+    response = client.post('/create-group', data={
+        'name': 'Second Circle',
+        'description': 'Code collides on the first try',
+        'contribution_amount': '25',
+        'contribution_frequency': 'monthly'
+    }, follow_redirects=True)
+
+    assert b'Group code: ABCD1234' in response.data
+    membership = Member.query.filter_by(user_id=test_user.id).one()
+    assert db.session.get(Group, membership.group_id).group_code == 'ABCD1234'
+    assert membership.role == 'admin'
+
+def test_ledger_pages_with_cursor(client, login, group_with_activity, test_admin_user, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, 'LEDGER_PAGE_SIZE', 2)
+    login(test_admin_user)
+
+    first_page = client.get(f'/group/{group_with_activity.id}/ledger')
+
+    assert first_page.data.count(b'<tr>') == 3
+    assert b'Older transactions' in first_page.data
+    assert b'$115.50' in first_page.data
+
+    oldest = Transaction.query.order_by(Transaction.transaction_date, Transaction.id).first()
+    second = Transaction.query.order_by(Transaction.transaction_date, Transaction.id).offset(1).first()
+    second_page = client.get(f'/group/{group_with_activity.id}/ledger', query_string={
+        'before': second.transaction_date.isoformat(),
+        'before_id': second.id
+    })
+
+    assert second_page.data.count(b'<tr>') == 2
+    assert f'+${oldest.amount:.2f}'.encode() in second_page.data
+    assert b'Older transactions' not in second_page.data
+    assert b'$115.50' in second_page.data
+
+def test_add_transactions_batch(client, login, group_with_activity, test_admin_user, test_user):
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transactions', json=[
+        {'transaction_type': 'contribution', 'amount': 10, 'member_id': member.id},
+        {'transaction_type': 'contribution', 'amount': '2.50', 'member_id': member.id, 'description': 'Late fee'},
+        {'transaction_type': 'payout', 'amount': 5, 'member_id': member.id},
+    ])
+
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True, 'count': 3}
+    assert Transaction.query.filter_by(member_id=member.id).count() == 5
+
+    ledger = client.get(f'/group/{group_with_activity.id}/ledger')
+    assert b'$128.00' in ledger.data
+    assert b'$35.00' in ledger.data
+
+def test_add_transactions_rejects_whole_batch(client, login, group_with_activity, test_admin_user, test_user):
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transactions', json=[
+        {'transaction_type': 'contribution', 'amount': 10, 'member_id': member.id},
+        {'transaction_type': 'contribution', 'amount': 10, 'member_id': 9999},
+    ])
+
+    assert response.status_code == 400
+    assert Transaction.query.count() == 3
+
+def test_add_transaction_notifies_members_in_one_batch(client, login, group_with_activity, test_admin_user, test_user, monkeypatch):
+    import notifications
+    sent = []
+    monkeypatch.setattr(notifications, 'send_bulk_email', lambda to_emails, subject, html: sent.append((to_emails, subject)))
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    client.post(f'/group/{group_with_activity.id}/add-transaction', data={
+        'transaction_type': 'contribution',
+        'amount': '12.00',
+        'member_id': member.id
+    })
+    notifications.notification_sender.submit(lambda: None).result()
+
+    assert sent == [(['admin@example.com', 'test@example.com'], 'New Contribution in Test Group')]
+
+def test_create_group_lists_seeded_traditions(client, app, login, test_user):
+    from traditions_data import seed_traditions
+    seed_traditions()
+
+    login(test_user)
+
+    response = client.get('/create-group')
+
+    assert response.status_code == 200
+    assert b'Susu' in response.data
+
+def test_export_report_streams_csv(client, login, group_with_activity, test_admin_user):
+    login(test_admin_user)
+
+    response = client.get(f'/group/{group_with_activity.id}/export-report')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.headers['X-Accel-Buffering'] == 'no'
+    assert response.mimetype == 'text/csv'
+    body = response.get_data(as_text=True)
+    assert 'Total Contributions,USD 115.50' in body
+    assert 'testuser,member' in body
+    assert 'USD 75.50,USD 30.00' in body
+    assert body.count(',contribution,') == 2
+    assert body.count(',payout,') == 1
+
+def test_add_ghost_user_skips_password_hashing(client, app, login, test_group, test_admin_user):
+    from models import User
+    login(test_admin_user)
+
+    client.post(f'/group/{test_group.id}/add-ghost-user', data={'ghost_name': 'Seat 7'})
+
+    ghost = User.query.filter_by(is_ghost=True).one()
+    assert re.fullmatch(r'ghost-[0-9a-f]{16}', ghost.username)
+    assert ghost.password_hash == '!'
+    assert not ghost.check_password('!')
+    assert Member.query.filter_by(user_id=ghost.id, group_id=test_group.id, is_ghost=True).count() == 1
+
+def test_remove_ghost_user_checks_group(client, app, login, add_group, test_group, test_admin_user):
+    from models import User
+    login(test_admin_user)
+    client.post(f'/group/{test_group.id}/add-ghost-user', data={'ghost_name': 'Seat 7'})
+    ghost_member = Member.query.filter_by(is_ghost=True).one()
+
+    other_group = add_group(test_admin_user, 'Other', 'OTHER1')
+
+    wrong_group = client.post(f'/group/{other_group.id}/remove-ghost/{ghost_member.id}')
+    assert wrong_group.status_code == 404
+
+    response = client.post(f'/group/{test_group.id}/remove-ghost/{ghost_member.id}', follow_redirects=True)
+    assert b'Ghost user removed successfully.' in response.data
+    assert Member.query.filter_by(is_ghost=True).count() == 0
+
+def test_add_ghost_user_unknown_group(client, app, login, test_admin_user):
+    login(test_admin_user)
+
+    response = client.post('/group/9999/add-ghost-user', data={'ghost_name': 'Seat 7'})
+
+    assert response.status_code == 404
+
+def test_add_transaction_queues_badge_email(client, login, group_with_activity, test_admin_user, test_user, monkeypatch):
+    import notifications
+    from models import Badge
+    sent = []
+    monkeypatch.setattr(notifications, 'send_bulk_email', lambda to_emails, subject, html: None)
+    monkeypatch.setattr(notifications, 'send_badge_notification', lambda email, name, description: sent.append((email, name)))
+    db.session.add(Badge(name='Steady Saver', description='Contributed $100 or more', icon='💪',
+                         criteria_type='total_contributions', criteria_value=100))
+    db.session.commit()
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transaction', data={
+        'transaction_type': 'contribution',
+        'amount': '30.00',
+        'member_id': member.id
+    }, follow_redirects=True)
+    notifications.notification_sender.submit(lambda: None).result()
+
+    assert 'Badges: Steady Saver' in response.get_data(as_text=True)
+    assert sent == [('test@example.com', 'Steady Saver')]
+
+@pytest.mark.parametrize('entry', [
+    {'transaction_type': 'contribution', 'amount': 'NaN'},
+    {'transaction_type': 'contribution', 'amount': 'Infinity'},
+    {'transaction_type': 'contribution', 'amount': '10000000000'},
+    {'transaction_type': ['contribution'], 'amount': 10},
+    {'transaction_type': {'type': 'contribution'}, 'amount': 10},
+    {'transaction_type': 'contribution', 'amount': 10, 'description': {'text': 'Late fee'}},
+])
+def test_add_transactions_rejects_malformed_entries(client, login, group_with_activity, test_admin_user, test_user, entry):
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transactions', json=[
+        dict(entry, member_id=member.id)
+    ])
+
+    assert response.status_code == 400
+    assert Transaction.query.count() == 3
+
+def test_add_transactions_json_api_skips_form_csrf(client, app, login, group_with_activity, test_admin_user, test_user):
+    app.config['WTF_CSRF_ENABLED'] = True
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transactions', json=[
+        {'transaction_type': 'contribution', 'amount': 10, 'member_id': member.id},
+    ])
+    assert response.status_code == 200
+
+    form_post = client.post(f'/group/{group_with_activity.id}/add-transactions', data={
+        'transaction_type': 'contribution', 'amount': 10, 'member_id': member.id
+    })
+    assert form_post.status_code == 415
+    assert Transaction.query.count() == 4
+
+@pytest.mark.parametrize('amount', ['NaN', '-5.00', 'abc', 'Infinity', '10000000000'])
+def test_add_transaction_rejects_invalid_amount(client, login, group_with_activity, test_admin_user, test_user, amount):
+    login(test_admin_user)
+    member = Member.query.filter_by(user_id=test_user.id).one()
+
+    response = client.post(f'/group/{group_with_activity.id}/add-transaction', data={
+        'transaction_type': 'contribution',
+        'amount': amount,
+        'member_id': member.id
+    }, follow_redirects=True)
+
+    assert response.status_code == 200
+    assert b'Please enter a valid amount.' in response.data
+    assert Transaction.query.count() == 3
+    assert db.session.get(Group, group_with_activity.id).total_contributions == Decimal('115.50')
+
+def test_id_only_views_skip_the_user_lookup(client, app, login, group_with_activity, test_admin_user):
+    from sqlalchemy import event
+    login(test_admin_user)
+    group_id = group_with_activity.id
+    # Forget the fixtures' rows so any lookup has to reach the database
+    db.session.expunge_all()
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(f'/group/{group_id}/ledger')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 200
+    # The ledger still batch-loads member users for display; only the session user's row lookup should be gone
+    assert not any('WHERE user.id = ?' in statement for statement in statements)
@@ -0,0 +1,125 @@
+import importlib.util
+import os
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'app', 'migrations', 'versions')
+
+def load_revision(filename):
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(VERSIONS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_upgrade(engine, revision):
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            revision.upgrade()
+
+@pytest.fixture
+def legacy_engine():
+    """Tables as they were before the running totals, with a little history in them"""
+    engine = sa.create_engine('sqlite://')
+    with engine.begin() as connection:
+        for statement in (
+            'CREATE TABLE "group" (id INTEGER PRIMARY KEY, name VARCHAR(100))',
+            'CREATE TABLE member (id INTEGER PRIMARY KEY, group_id INTEGER, is_active BOOLEAN)',
+            'CREATE TABLE "transaction" (id INTEGER PRIMARY KEY, group_id INTEGER, member_id INTEGER, '
+            'transaction_type VARCHAR(20), amount FLOAT NOT NULL)',
+            'INSERT INTO "group" VALUES (1, \'Busy\'), (2, \'Quiet\')',
+            'INSERT INTO member VALUES (1, 1, 1), (2, 1, 1), (3, 1, 0), (4, 2, 0)',
+            'INSERT INTO "transaction" VALUES (1, 1, 1, \'contribution\', 120.5), '
+            '(2, 1, 2, \'contribution\', 9.5), (3, 1, 1, \'payout\', 30), (4, 2, 3, \'contribution\', 0.1 + 0.2)',
+        ):
+            connection.exec_driver_sql(statement)
+    return engine
+
+def test_running_totals_are_backfilled(legacy_engine):
+    run_upgrade(legacy_engine, load_revision('3f1c9a2d7b40_group_running_totals.py'))
+
+    with legacy_engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            'SELECT id, total_contributions, total_payouts, member_count FROM "group" ORDER BY id'
+        ).all()
+
+    assert [(row[0], float(row[1]), float(row[2]), row[3]) for row in rows] == [
+        (1, 130.0, 30.0, 2),
+        (2, 0.3, 0.0, 0),
+    ]
+
+def test_transaction_amount_becomes_numeric(legacy_engine):
+    run_upgrade(legacy_engine, load_revision('3f1c9a2d7b40_group_running_totals.py'))
+
+    amount = next(column for column in sa.inspect(legacy_engine).get_columns('transaction') if column['name'] == 'amount')
+    assert isinstance(amount['type'], sa.Numeric) and not isinstance(amount['type'], sa.Float)
+    assert (amount['type'].precision, amount['type'].scale) == (12, 2)
+    with legacy_engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT amount FROM "transaction" WHERE id = 4').scalar() == 0.3
+
+def test_advice_context_text_becomes_json():
+    engine = sa.create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE personalized_advice (id INTEGER PRIMARY KEY, advice_text TEXT NOT NULL, context_data TEXT)'
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO personalized_advice VALUES (1, 'a', 'total_saved: 600.0, recent_contributions: 4'), "
+            "(2, 'b', '{\"total_saved\": 5.0, \"recent_count\": 1}'), (3, 'c', 'something else'), (4, 'd', NULL)"
+        )
+
+    run_upgrade(engine, load_revision('8b2e5d0c4a17_advice_context_json.py'))
+
+    context = sa.table('personalized_advice', sa.column('id'), sa.column('context_data', sa.JSON))
+    with engine.connect() as connection:
+        rows = connection.execute(sa.select(context.c.id, context.c.context_data).order_by(context.c.id)).all()
+    assert [tuple(row) for row in rows] == [
+        (1, {'total_saved': 600.0, 'recent_count': 4}),
+        (2, {'total_saved': 5.0, 'recent_count': 1}),
+        (3, None),
+        (4, None),
+    ]
+
+@pytest.fixture
+def unindexed_engine():
+    """The current tables without any of their secondary indexes, as older deployments have them"""
+    from models import db
+    engine = sa.create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.exec_driver_sql(f'DROP INDEX "{index.name}"')
+    return engine
+
+def test_lookup_indexes_are_created(unindexed_engine):
+    revision = load_revision('c5d81f3e9a62_add_lookup_indexes.py')
+    run_upgrade(unindexed_engine, revision)
+    run_upgrade(unindexed_engine, revision)
+
+    inspector = sa.inspect(unindexed_engine)
+    created = {
+        index['name'] for table in inspector.get_table_names() for index in inspector.get_indexes(table)
+    }
+    assert {
+        'ix_member_group_active',
+        'ix_txn_group_type',
+        'ix_txn_group_date',
+        'ix_tx_member_type_date',
+        'ix_personalized_advice_user_displayed_created',
+        'ix_pt_user_date',
+        'ix_member_user_active',
+        'ix_member_user_group_role',
+        'ix_member_group_status',
+        'ix_group_contribution_amount',
+    } <= created
+
+def test_every_model_index_has_a_migration(unindexed_engine):
+    from models import db
+    run_upgrade(unindexed_engine, load_revision('c5d81f3e9a62_add_lookup_indexes.py'))
+
+    inspector = sa.inspect(unindexed_engine)
+    for table in db.metadata.sorted_tables:
+        declared = {index.name for index in table.indexes}
+        assert declared <= {index['name'] for index in inspector.get_indexes(table.name)}, table.name
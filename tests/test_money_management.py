@@ -0,0 +1,78 @@
+import pytest
+from datetime import datetime, timedelta
+from models import PlaidAccount, PersonalTransaction, db
+
+def _spend(user, amount, is_income=False, days_ago=1):
+    db.session.add(PersonalTransaction(
+        user_id=user.id,
+        amount=amount,
+        is_income=is_income,
+        description='Paycheck' if is_income else 'Groceries',
+        transaction_date=datetime.utcnow() - timedelta(days=days_ago)
+    ))
+
+def test_money_management_totals(client, app, login, test_user):
+    _spend(test_user, 1200.00, is_income=True)
+    _spend(test_user, 150.25)
+    _spend(test_user, 49.75)
+    _spend(test_user, 999.00, days_ago=45)
+    db.session.commit()
+
+    login(test_user)
+
+    response = client.get('/money-management')
+
+    assert response.status_code == 200
+    assert b'$1200.00' in response.data
+    assert b'$200.00' in response.data
+    assert b'$1000.00' in response.data
+    assert b'$999.00' not in response.data
+
+def test_money_management_without_transactions(client, app, login, test_user):
+    login(test_user)
+
+    response = client.get('/money-management')
+
+    assert response.status_code == 200
+    assert response.data.count(b'$0.00') == 3
+
+def test_money_management_lists_accounts_and_transactions(client, app, login, test_user):
+    account = PlaidAccount(
+        user_id=test_user.id,
+        access_token='access-sandbox-token',
+        item_id='item-1',
+        institution_name='Credit Union',
+        current_balance=310.40
+    )
+    db.session.add(account)
+    db.session.commit()
+    db.session.add(PersonalTransaction(
+        user_id=test_user.id,
+        plaid_account_id=account.id,
+        amount=42.00,
+        merchant_name='Marche Salomon',
+        transaction_date=datetime.utcnow()
+    ))
+    db.session.commit()
+
+    login(test_user)
+
+    response = client.get('/money-management')
+
+    assert response.status_code == 200
+    assert b'Credit Union' in response.data
+    assert b'$310.40' in response.data
+    assert b'Marche Salomon' in response.data
+
+def test_money_management_totals_refresh_after_new_transaction(client, app, login, test_user):
+    _spend(test_user, 80.00)
+    db.session.commit()
+
+    login(test_user)
+
+    assert b'$80.00' in client.get('/money-management').data
+
+    _spend(test_user, 20.00)
+    db.session.commit()
+
+    assert b'$100.00' in client.get('/money-management').data
@@ -0,0 +1,25 @@
+import pytest
+from models import UserFinancialProfile, db
+
+def test_survey_results_match_contribution_range(client, app, login, add_group, test_user, test_admin_user):
+    db.session.add(UserFinancialProfile(
+        user_id=test_user.id,
+        income_range='50k_75k',
+        savings_habit='monthly',
+        financial_goal='emergency_fund',
+        risk_tolerance='low',
+        employment_status='employed',
+        preferred_group_size='small',
+        contribution_comfort_level='100_250'
+    ))
+    for index in range(10):
+        add_group(test_admin_user, f'Small Circle {index}', f'SMALL{index}', 20.00)
+    add_group(test_admin_user, 'Big Circle', 'BIG0001', 150.00)
+
+    login(test_user)
+
+    response = client.get('/survey-results')
+
+    assert response.status_code == 200
+    assert b'Big Circle' in response.data
+    assert b'Small Circle' not in response.data